@@ -0,0 +1 @@
+# Benchmarks for the game logic, rendering and graphs, run with: python -m benchmarks --help
@@ -0,0 +1,106 @@
+# Runs the benchmarks, prints a table, writes the results as JSON and optionally compares them with a baseline
+# Usage: python -m benchmarks                                       run everything
+#        python -m benchmarks --filter snake_update                  only the cases with this in their name
+#        python -m benchmarks --save-baseline                        save this run as benchmarks/baseline.json
+#        python -m benchmarks --baseline benchmarks/baseline.json    compare with a run saved on the same machine
+# Timings depend on the machine, so nothing is compared unless a baseline is given
+import os
+
+# Headless, so the benchmarks run anywhere and the display doesn't skew the timings
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import sys
+import time
+import pygame
+from benchmarks.cases import cases
+from benchmarks.timing import measure
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmark the game's hot paths")
+    parser.add_argument("--filter", default="", help="only run cases with this in their name")
+    parser.add_argument("--quick", action="store_true", help="take fewer samples, for a rough idea")
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(__file__), "latest.json"),
+                        help="file to write the results to as JSON")
+    parser.add_argument("--baseline", help="results of an earlier run on this machine to compare with")
+    parser.add_argument("--save-baseline", nargs="?", const=BASELINE, metavar="FILE",
+                        help=f"save these results as a baseline, to {os.path.relpath(BASELINE)} by default")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="slow down, as a fraction of the baseline's ops/sec, reported as a regression")
+    return parser.parse_args()
+
+
+def compare(results, baseline, threshold):
+    """Ratio of ops/sec to the baseline's for every case in both, and the names of the cases that regressed"""
+    ratios = {}
+    regressions = []
+    for name, result in results.items():
+        if name in baseline and baseline[name]["ops_per_sec"]:
+            ratios[name] = result["ops_per_sec"] / baseline[name]["ops_per_sec"]
+            if ratios[name] < 1 - threshold:
+                regressions.append(name)
+    return ratios, regressions
+
+
+def main():
+    args = parse_args()
+    pygame.display.set_mode((800, 600))
+
+    baseline = {}
+    if args.baseline:
+        try:
+            with open(args.baseline) as file:
+                baseline = json.load(file)["results"]
+        except (OSError, ValueError, KeyError) as e:
+            sys.exit(f"Can't read the baseline {args.baseline}: {e}")
+
+    print(f"{'Case':<52}{'ops/s':>12}{'p50 us':>11}{'p90 us':>11}{'p99 us':>11}{'vs base':>9}")
+    results = {}
+    for name, make, batch, samples in cases():
+        if args.filter not in name:
+            continue
+        if args.quick:
+            samples = max(3, samples // 6)
+
+        result = results[name] = measure(make(), samples, batch)
+        ratio = f"{result['ops_per_sec'] / baseline[name]['ops_per_sec']:.2f}x" if name in baseline else ""
+        print(f"{name:<52}{result['ops_per_sec']:>12.1f}{result['p50_us']:>11.1f}{result['p90_us']:>11.1f}"
+              f"{result['p99_us']:>11.1f}{ratio:>9}", flush=True)
+
+    report = {
+        "meta": {
+            "time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    ratios, regressions = compare(results, baseline, args.threshold)
+    if baseline:
+        report["vs_baseline"] = ratios
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Saved as a baseline in {args.save_baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} regressions of more than {args.threshold:.0%} against {args.baseline}:")
+        for name in regressions:
+            print(f"  {name}: {ratios[name]:.2f}x")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
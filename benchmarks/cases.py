@@ -0,0 +1,220 @@
+# Benchmark cases for the game's hot paths: moving the snake, spawning apples, rendering and building graphs
+# Each case is set up only when it is run, so filtering out the big boards skips building them
+import importlib.util
+import random
+import time
+from collections import deque
+import pygame
+from src.apple import Apple
+from src.board import Board
+from src.graphs import render_graph, render_native_graph, graph_to_surface
+from src.grid import SNAKE
+from src.renderer import BoardRenderer, SnakeRenderer
+from src.rules import board_sizes, board_dimensions
+from src.snake import Snake
+from benchmarks.timing import timed
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+GRAPH_SIZE = (640, 300)  # Size of the graph on the statistics screen
+
+# (name, grid size in pixels, width, height), the presets of the game and some much bigger boards
+SIZES = [(board_size, *board_dimensions(board_size)) for board_size in board_sizes] + [
+    ("200x200", 4, 200, 200),
+    ("1000x1000", 1, 1000, 1000),
+]
+
+
+def cycle_path(width, height):
+    """Cells of a loop through the board that a snake can follow forever, in order
+    Rows are swept back and forth and column 0 leads back to the start. The loop needs an even
+    number of rows, so on a board with an odd number of rows the last one is left out."""
+    rows = height - height % 2
+    path = [(x, 0) for x in range(width)]
+    for y in range(1, rows):
+        xs = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        path.extend((x, y) for x in xs)
+    path.extend((0, y) for y in range(rows - 1, 0, -1))
+    return path
+
+
+class SnakeSetup:
+    """A snake of the given length lying along cycle_path, with an apple, and the way round the loop"""
+    def __init__(self, width, height, length):
+        self.width = width
+        self.height = height
+        self.length = length
+        self.path = cycle_path(width, height)
+
+        # Direction to move in from each cell to stay on the loop, by cell index
+        self.next_direction = [0] * (width * height)
+        for i, (x, y) in enumerate(self.path):
+            next_x, next_y = self.path[(i + 1) % len(self.path)]
+            self.next_direction[y * width + x] = DIRECTIONS.index((next_x - x, next_y - y))
+        self.reset()
+
+    def reset(self):
+        self.board = Board(self.width, self.height, random.Random(0))
+        head = self.path[self.length - 1]
+        self.snake = Snake(*head, self.board)
+        self.snake.segments = deque(self.path[i] for i in range(self.length - 1, -1, -1))
+        for x, y in self.snake.segments:
+            self.board.grid.set(x, y, SNAKE)
+        self.snake.segments_to_update = set()
+        self.steer()
+        self.apple = Apple(self.board)
+
+    def steer(self):
+        x, y = self.snake.segments[0]
+        self.snake.direction = DIRECTIONS[self.next_direction[y * self.width + x]]
+
+    def update(self):
+        """Move the snake one square along the loop, starting again if the game ended"""
+        self.steer()
+        state = self.snake.update(self.apple)
+        self.snake.events.clear()
+        if state != "game":
+            self.reset()
+        return state
+
+
+def lengths(width, height):
+    """Snake lengths to test with, a new game's and one filling half the board"""
+    return [("short", 4), ("long", len(cycle_path(width, height)) // 2)]
+
+
+def snake_update(width, height, length):
+    setup = SnakeSetup(width, height, length)
+
+    def run(n):
+        elapsed = 0.0
+        for _ in range(n):
+            setup.steer()
+            snake = setup.snake
+            start = time.perf_counter()
+            state = snake.update(setup.apple)
+            elapsed += time.perf_counter() - start
+
+            # Normally cleared by the renderers and the frontend
+            snake.segments_to_update.clear()
+            snake.events.clear()
+            if state != "game":
+                setup.reset()
+        return elapsed
+    return run
+
+
+def apple_spawn(width, height, length):
+    setup = SnakeSetup(width, height, length)
+    apple = setup.apple
+    grid = setup.board.grid
+
+    def run(n):
+        elapsed = 0.0
+        for _ in range(n):
+            # Take the apple off the board, then time putting a new one on
+            for x, y in apple.positions:
+                grid.clear(x, y)
+            apple.positions.clear()
+            apple.positions_to_render.clear()
+
+            start = time.perf_counter()
+            apple.spawn()
+            elapsed += time.perf_counter() - start
+        return elapsed
+    return run
+
+
+def render_surface(grid_size, width, height):
+    # Same size and pixel format as the game's render surface
+    return pygame.Surface((width * grid_size + 5, height * grid_size + 5)).convert()
+
+
+def board_render_init(grid_size, width, height):
+    board = Board(width, height)
+    renderer = BoardRenderer(board, grid_size)
+    surface = render_surface(grid_size, width, height)
+    return timed(lambda: renderer.render(surface, True))
+
+
+def board_render_incremental(grid_size, width, height, squares):
+    board = Board(width, height)
+    renderer = BoardRenderer(board, grid_size)
+    surface = render_surface(grid_size, width, height)
+    renderer.render(surface, True)
+    rng = random.Random(0)
+    cells = [(rng.randrange(width), rng.randrange(height)) for _ in range(4096)]
+
+    def run(n):
+        elapsed = 0.0
+        for i in range(n):
+            # A tick usually empties the old tail square and maybe an eaten apple's
+            board.squares_to_update.update(cells[(i * squares + j) % len(cells)] for j in range(squares))
+            start = time.perf_counter()
+            renderer.render(surface)
+            elapsed += time.perf_counter() - start
+        return elapsed
+    return run
+
+
+def snake_render(grid_size, width, height, length, alpha):
+    setup = SnakeSetup(width, height, length)
+    surface = render_surface(grid_size, width, height)
+    renderer = None
+
+    def run(n):
+        nonlocal renderer
+        elapsed = 0.0
+        for _ in range(n):
+            setup.update()
+            if renderer is None or renderer.snake is not setup.snake:
+                renderer = SnakeRenderer(setup.snake, grid_size, setup.apple)
+            start = time.perf_counter()
+            renderer.render(surface, alpha)
+            elapsed += time.perf_counter() - start
+        return elapsed
+    return run
+
+
+def graph_data(graph_type, points):
+    rng = random.Random(0)
+    if graph_type == "Score vs Player":
+        return [f"Player {i}" for i in range(points)], sorted((rng.randrange(2000) for _ in range(points)), reverse=True)
+    return list(range(1, points + 1)), [rng.randrange(2000) for _ in range(points)]
+
+
+def generate_graph(backend, graph_type, points):
+    data = graph_data(graph_type, points)
+    if backend == "pygame":
+        return timed(lambda: render_native_graph(graph_type, "Slow", "Small", data, GRAPH_SIZE))
+    return timed(lambda: graph_to_surface(render_graph(graph_type, "Slow", "Small", data, GRAPH_SIZE), GRAPH_SIZE))
+
+
+def cases():
+    """(name, make, batch, samples) of every case, make() sets the case up and returns its run(n) function"""
+    all_cases = []
+    for name, grid_size, width, height in SIZES:
+        # Fewer operations per batch on the big boards, where a render takes milliseconds
+        big = width * height > 10000
+        for length_name, length in lengths(width, height):
+            all_cases.append((f"snake_update[{name},{length_name}]",
+                              lambda w=width, h=height, l=length: snake_update(w, h, l), 1000, 30))
+            all_cases.append((f"apple_spawn[{name},{length_name}]",
+                              lambda w=width, h=height, l=length: apple_spawn(w, h, l), 1000, 30))
+            all_cases.append((f"snake_render[{name},{length_name}]",
+                              lambda g=grid_size, w=width, h=height, l=length: snake_render(g, w, h, l, 0.5),
+                              200, 30))
+        all_cases.append((f"board_render_init[{name}]",
+                          lambda g=grid_size, w=width, h=height: board_render_init(g, w, h), 2 if big else 50, 20))
+        for squares in (2, 64):
+            all_cases.append((f"board_render_incremental[{name},{squares}]",
+                              lambda g=grid_size, w=width, h=height, s=squares: board_render_incremental(g, w, h, s),
+                              200, 30))
+
+    backends = [("pygame", 10, 20)]
+    if importlib.util.find_spec("matplotlib"):
+        backends.append(("matplotlib", 1, 5))
+    for backend, batch, samples in backends:
+        for graph_type, points in (("Score vs Player", 20), ("Score vs Attempts", 100), ("Score vs Attempts", 10000)):
+            all_cases.append((f"generate_graph[{backend},{graph_type},{points}]",
+                              lambda b=backend, t=graph_type, p=points: generate_graph(b, t, p), batch, samples))
+    return all_cases
@@ -0,0 +1,47 @@
+# Runs a benchmark case and summarises its timings
+import time
+
+
+def percentile(values, fraction):
+    """Value below which the given fraction of the sorted values fall, interpolating between neighbours"""
+    position = (len(values) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def measure(run, samples=30, batch=100, warmup=2, min_time=0.0):
+    """Time a case, run(n) does n operations and returns how many seconds the timed part took
+    Each sample is one batch, the percentiles are of the mean time per operation of each batch.
+    Keeps taking samples past the given number until min_time seconds have been measured."""
+    for _ in range(warmup):
+        run(batch)
+
+    times = []
+    total = 0.0
+    while len(times) < samples or total < min_time:
+        elapsed = run(batch)
+        times.append(elapsed / batch)
+        total += elapsed
+
+    times.sort()
+    ops = len(times) * batch
+    return {
+        "ops_per_sec": ops / total if total else 0.0,
+        "mean_us": total / ops * 1e6,
+        "p50_us": percentile(times, 0.5) * 1e6,
+        "p90_us": percentile(times, 0.9) * 1e6,
+        "p99_us": percentile(times, 0.99) * 1e6,
+        "samples": len(times),
+        "ops": ops,
+    }
+
+
+def timed(operation):
+    """Turn an operation with no arguments into a run(n) function that times all n calls"""
+    def run(n):
+        start = time.perf_counter()
+        for _ in range(n):
+            operation()
+        return time.perf_counter() - start
+    return run
@@ -1,12 +1,19 @@
+import argparse
+import random
 import sys
+from src import startup  # Imported first so its clock starts before everything else loads
 from src.config import *
-from src.db_handler import connect_database, save_score, get_scores_data
-from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
-from matplotlib.figure import Figure
-from src.main_menu import Button, Dropdown, ScrollableText, TextInput
-from src.snake import Snake
-from src.apple import Apple
-from src.board import Board
+from src.db_handler import ScoreWriter, ScoreHistory, get_scores_data, get_replay
+from src.main_menu import Button, Dropdown, ScrollableText, TextInput, SurfaceView
+from src.game import Game
+from src.renderer import BoardRenderer, SnakeRenderer, AppleRenderer
+from src.scheduler import FixedTimestep
+from src.screen_cache import CachedScreen
+from src.text import get_font, render_text
+from src.audio import AudioService, MixerBackend, NullBackend
+from src.worker import Worker
+from src.graphs import render_graph, render_native_graph, graph_to_surface
+from src.replay import Replay
 
 # Constants
 SCREEN_WIDTH = 800
@@ -14,22 +21,39 @@ SCREEN_HEIGHT = 600
 GRID_SIZE = 90
 GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
 GRID_HEIGHT = int(SCREEN_HEIGHT * (3/4) // GRID_SIZE)
-FPS = 60
+FPS = 60  # Frame rate cap, 0 renders as fast as possible
+VSYNC = False  # Sync frames to the monitor refresh rate
+MAX_CATCH_UP_TICKS = 5  # Most logic ticks run in one frame to catch up after a stall
+FULL_FLIP_AREA = 0.5  # Flip the whole screen instead of updating dirty rects above this share of the screen
+PREWARM_GRAPHS = True  # Build the graphs the player is likely to look at next while the statistics screen is idle
 
 # Set up display
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+if VSYNC:
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SCALED, vsync=1)
+else:
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
 pygame.display.set_caption('Snake Game')
+sounds.preload()  # Load the sounds in the background while the menu comes up
+
+# Plays the sound events raised by the game logic, silently when there is no audio device
+if pygame.mixer.get_init():
+    audio = AudioService(MixerBackend(sounds, sound_channels), sound_priorities, sound_min_intervals)
+else:
+    audio = AudioService(NullBackend())
 clock = pygame.time.Clock()
 
 selected_graph_speed = speeds[0]
 selected_graph_size = board_sizes[0]
 selected_graph_type = graph_types[0]
-graph_surface = None
+graph_cache = {}  # Graph surfaces by (graph_type, snake_speed, board_size)
+graph_requested = None  # Key of the graph the worker is building
+score_histories = {}  # ScoreHistory of each (snake_speed, board_size), loaded further back with the Load More button
 current_screen = "main_menu"
 
 # Graph stuff
 graph_width = SCREEN_WIDTH * 0.8
 graph_height = SCREEN_HEIGHT * 0.5
+graph_size = (graph_width, graph_height)
 
 # Game Setup
 
@@ -40,9 +64,22 @@ player_name = "Player"
 # Initialize game objects
 
 render_surface = None
-snake = None
-apple = None
-board = None
+game = None
+session_rng = random.Random()  # Seeds each new game, --seed makes the whole session repeatable
+watching = None  # Replay being played back instead of taking input from the keyboard
+replay_position = 0  # Next input of the replay
+board_renderer = None
+snake_renderer = None
+apple_renderer = None
+logic_clock = None  # Runs the snake moves at a fixed rate, independent of the frame rate
+
+# Arrow keys and the direction they steer the snake in
+key_directions = {
+    pygame.K_UP: (0, -1),
+    pygame.K_DOWN: (0, 1),
+    pygame.K_LEFT: (-1, 0),
+    pygame.K_RIGHT: (1, 0)
+}
 
 # Create main menu buttons
 new_game_button = Button(SCREEN_WIDTH // 2 - 100, 200, 200, 50, "New Game", LIGHT_GREEN, LIME_GREEN)
@@ -51,6 +88,7 @@ statistics_button = Button(SCREEN_WIDTH // 2 - 100, 360, 200, 50, "Statistics",
 
 # Back button for other screens
 back_button = Button(SCREEN_WIDTH // 2 - 100, 520, 200, 50, "Back to Menu", LIGHT_GREEN, LIME_GREEN)
+load_more_button = Button(SCREEN_WIDTH - 200, 520, 170, 50, "Load More", LIGHT_GREEN, LIME_GREEN)
 
 # Create dropdown for game modes
 graph_speed_dropdown = Dropdown(SCREEN_WIDTH * 0.14, SCREEN_HEIGHT * 0.16, SCREEN_WIDTH * 0.15, 25, speeds, LIGHT_GREEN,
@@ -110,67 +148,62 @@ Snake Game Rules:
 
 how_to_play_text = ScrollableText(100, 100, 600, 400, how_to_play_content)
 
+# Area the statistics graph is shown in
+graph_view = SurfaceView(SCREEN_WIDTH * 0.12, SCREEN_HEIGHT / 3, graph_width, graph_height)
+
+
+def get_graph_data(graph_type, snake_speed, board_size):
+    """Player names or score ids, and the scores, for a graph"""
+    if graph_type == "Score vs Player":
+        player_names, scores, _ = get_scores_data(snake_speed, board_size, True)
+        return player_names, scores
+
+    history = score_histories.get((snake_speed, board_size))
+    if history is None:
+        history = score_histories[(snake_speed, board_size)] = ScoreHistory(snake_speed, board_size)
+        history.load_more()
+    # Oldest first, so the line runs left to right
+    return history.ids[::-1], history.scores[::-1]
+
 
 # Function to generate graph surface
 def generate_graph(graph_type, snake_speed, board_size):
-    try:
-        player_names, scores, ids = get_scores_data(snake_speed, board_size, graph_type == "Score vs Player")
-
-        # Create a fixed-size surface for the graph
-        surf = pygame.Surface((graph_width, graph_height))
-        surf.fill(WHITE)
-
-        if not scores:
-            # Display a message if no data
-            no_data_text = medium_font.render(f"No Data Available for {snake_speed} Speed with {board_size} Size", True,
-                                              BLACK)
-            text_rect = no_data_text.get_rect(center=(graph_width // 2, graph_height // 2))
-            surf.blit(no_data_text, text_rect)
-            return surf
-
-        # Create matplotlib figure without using plt.figure() as that scales the window down for some reason
-
-        fig = Figure(figsize=(graph_width / 80, graph_height / 80), dpi=80)
-        ax = fig.add_subplot(111)
-
-        if graph_type == "Score vs Player":
-            # Create a bar graph of scores by player
-            ax.bar(range(len(player_names)), scores, color=pygame.Color(FOREST_GREEN).normalize())
-            ax.set_xticks(range(len(player_names)))
-            ax.set_xticklabels(player_names, rotation=45, ha='right')
-            ax.set_ylabel('Score')
-            ax.set_title(f'Top Scores for {snake_speed} Speed with {board_size} Board Size')
-        else:  # Score vs Attempt Num
-            # Create a line graph of scores over time
-            ax.plot(ids, scores, "o-", color=pygame.Color(FOREST_GREEN).normalize())
-            ax.set_ylabel('Score')
-            ax.set_title(f'Score History for {snake_speed} Speed with {board_size} Board Size')
-
-        fig.tight_layout()
-
-        # Convert the Matplotlib figure to a pygame surface
-        canvas = FigureCanvas(fig)
-        canvas.draw()
-
-        # Get the RGBA buffer from the figure canvas
-        buf = canvas.buffer_rgba()
-
-        # Create pygame surface from the buffer
-        graph_surf = pygame.image.frombuffer(
-            buf, (int(fig.bbox.width), int(fig.bbox.height)), "RGBA")
-
-        # Blit the graph to our fixed size surface
-        surf.blit(graph_surf, (0, 0))
-        return surf
-
-    except Exception as e:
-        print(f"Error generating graph: {e}")
-        # Return a blank surface with an error message
-        surf = pygame.Surface((graph_width, graph_height))
-        surf.fill(WHITE)
-        error_text = medium_font.render("Error generating graph", True, BLACK)
-        surf.blit(error_text, (200, 160))
-        return surf
+    data = get_graph_data(graph_type, snake_speed, board_size)
+    if graph_backend == "pygame":
+        return render_native_graph(graph_type, snake_speed, board_size, data, graph_size)
+    return graph_to_surface(render_graph(graph_type, snake_speed, board_size, data, graph_size), graph_size)
+
+
+# Graphs are built in the background, the placeholder is shown until the latest one is ready
+graph_worker = Worker(render_graph, "graph")
+graph_placeholder = graph_to_surface(("message", "Loading graph..."), graph_size)
+
+
+def prewarm_graph(graph_key):
+    """Start building the uncached graph closest to the one being shown, fewest dropdown changes away"""
+    global graph_requested
+    missing = [(graph_type, snake_speed, board_size) for graph_type in graph_types for snake_speed in speeds
+               for board_size in board_sizes if (graph_type, snake_speed, board_size) not in graph_cache]
+    if missing:
+        graph_requested = min(missing, key=lambda key: sum(a != b for a, b in zip(key, graph_key)))
+        graph_worker.request(*graph_requested, get_graph_data(*graph_requested), graph_size)
+
+
+def invalidate_graphs(snake_speed, board_size, graph_types=graph_types):
+    """Forget the graphs of a game mode, after a score was saved for it"""
+    global graph_requested
+    for graph_type in graph_types:
+        graph_cache.pop((graph_type, snake_speed, board_size), None)
+        if graph_requested == (graph_type, snake_speed, board_size):
+            graph_worker.cancel()
+            graph_requested = None
+
+
+def load_more_history(snake_speed, board_size):
+    """Show another chunk of older scores in the score history graph"""
+    history = score_histories.get((snake_speed, board_size))
+    if history and history.load_more():
+        invalidate_graphs(snake_speed, board_size, ["Score vs Attempts"])
 
 
 # Main menu elements
@@ -179,15 +212,10 @@ def draw_main_menu(surface):
     surface.fill(DARK_GREEN)
 
     # Draw title
-    title_text = title_font.render("Snake Game", True, WHITE)
+    title_text = render_text(title_font, "Snake Game", True, WHITE)
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
     surface.blit(title_text, title_rect)
 
-    # Draw buttons
-    new_game_button.draw(surface)
-    how_to_play_button.draw(surface)
-    statistics_button.draw(surface)
-
 
 # Player setup screen elements
 def draw_game_setup(surface):
@@ -195,63 +223,48 @@ def draw_game_setup(surface):
     surface.fill(DARK_GREEN)
 
     # Draw title
-    title_text = large_font.render("Game Setup", True, WHITE)
+    title_text = render_text(large_font, "Game Setup", True, WHITE)
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
     surface.blit(title_text, title_rect)
 
     # Player name label
-    name_label = medium_font.render("Player Name:", True, WHITE)
+    name_label = render_text(medium_font, "Player Name:", True, WHITE)
     surface.blit(name_label, (SCREEN_WIDTH * 0.2, SCREEN_HEIGHT * 0.2))
 
     # Speed label
-    speed_label = medium_font.render("Snake Speed:", True, WHITE)
+    speed_label = render_text(medium_font, "Snake Speed:", True, WHITE)
     surface.blit(speed_label, (SCREEN_WIDTH * 0.2, SCREEN_HEIGHT * 0.3))
 
     # Difficulty label
-    board_size_label = medium_font.render("Board Size:", True, WHITE)
+    board_size_label = render_text(medium_font, "Board Size:", True, WHITE)
     surface.blit(board_size_label, (SCREEN_WIDTH * 0.2, SCREEN_HEIGHT * 0.6))
 
-    # Draw text input
-    player_name_input.draw(surface)
-
-    # Draw dropdowns
-    speed_dropdown.draw(surface)
-    board_size_dropdown.draw(surface)
-
-    # Draw buttons
-    start_game_button.draw(surface)
-    back_to_menu_button.draw(surface)  # TextInput class for player name input
 
-
-def draw_game_over(surface, score):
+def draw_game_over(surface):
     # Display game over screen with option to restart
     surface.fill(BACKGROUND_COLOR)
-    font = pygame.font.SysFont(None, 72)
-    game_over_text = font.render('GAME OVER', True, RED)
-    score_text = font.render(f'Score: {score}', True, WHITE)
-    restart_text = font.render('Press R to Restart', True, WHITE)
+    font = get_font(None, 72)
+    game_over_text = render_text(font, 'GAME OVER', True, RED)
+    score_text = render_text(font, f'Score: {game.score}', True, WHITE)
+    restart_text = render_text(font, 'Press R to Restart', True, WHITE)
 
     surface.blit(game_over_text, (SCREEN_WIDTH * 0.5 - game_over_text.get_width() // 2, SCREEN_HEIGHT * 0.2))
     surface.blit(score_text, (SCREEN_WIDTH * 0.5 - score_text.get_width() // 2, SCREEN_HEIGHT * 0.4))
     surface.blit(restart_text, (SCREEN_WIDTH * 0.5 - restart_text.get_width() // 2, SCREEN_HEIGHT * 0.6))
 
-    back_button.draw(surface)
-
 
-def draw_game_won(surface, score):
+def draw_game_won(surface):
     # Display game over screen with option to restart
     surface.fill(BACKGROUND_COLOR)
-    font = pygame.font.SysFont(None, 72)
-    game_won_text = font.render('GAME WON', True, YELLOW)
-    score_text = font.render(f'Score: {score}', True, WHITE)
-    restart_text = font.render('Press R to Restart', True, WHITE)
+    font = get_font(None, 72)
+    game_won_text = render_text(font, 'GAME WON', True, YELLOW)
+    score_text = render_text(font, f'Score: {game.score}', True, WHITE)
+    restart_text = render_text(font, 'Press R to Restart', True, WHITE)
 
     surface.blit(game_won_text, (SCREEN_WIDTH * 0.5 - game_won_text.get_width() // 2, SCREEN_HEIGHT * 0.2))
     surface.blit(score_text, (SCREEN_WIDTH * 0.5 - score_text.get_width() // 2, SCREEN_HEIGHT * 0.4))
     surface.blit(restart_text, (SCREEN_WIDTH * 0.5 - restart_text.get_width() // 2, SCREEN_HEIGHT * 0.6))
 
-    back_button.draw(surface)
-
 
 # How to Play screen elements
 def draw_how_to_play(surface):
@@ -259,65 +272,50 @@ def draw_how_to_play(surface):
     surface.fill(DARK_GREEN)
 
     # Draw title
-    title_text = large_font.render("How to Play", True, WHITE)
+    title_text = render_text(large_font, "How to Play", True, WHITE)
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
     surface.blit(title_text, title_rect)
 
-    # Draw the scrollable text box
-    how_to_play_text.draw(surface)
-
-    # Draw back button
-    back_button.draw(surface)
-
 
 # Statistics screen elements
-def draw_statistics(surface, graph_surf):
+def draw_statistics(surface):
     # Draw background
     surface.fill(DARK_GREEN)
 
     # Draw title
-    title_text = large_font.render("Game Statistics", True, WHITE)
+    title_text = render_text(large_font, "Game Statistics", True, WHITE)
     title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 50))
     surface.blit(title_text, title_rect)
 
-    # Draw dropdowns
-    graph_speed_dropdown.draw(surface)
-    graph_size_dropdown.draw(surface)
-    graph_type_dropdown.draw(surface)
-
     # Snake Speed label
-    speed_label = medium_font.render("Speed:", True, WHITE)
+    speed_label = render_text(medium_font, "Speed:", True, WHITE)
     surface.blit(speed_label, (SCREEN_WIDTH * 0.03, SCREEN_HEIGHT * 0.15))
 
     # Snake Size label
-    size_label = medium_font.render("Size:", True, WHITE)
+    size_label = render_text(medium_font, "Size:", True, WHITE)
     surface.blit(size_label, (SCREEN_WIDTH * 0.31, SCREEN_HEIGHT * 0.15))
 
     # Graph type label
-    graph_label = medium_font.render("Graph Type:", True, WHITE)
+    graph_label = render_text(medium_font, "Graph Type:", True, WHITE)
     surface.blit(graph_label, (SCREEN_WIDTH * 0.57, SCREEN_HEIGHT * 0.15))
 
-    # Generate and draw the current graph
-    if not graph_surf:
-        graph_surf = generate_graph(selected_graph_type, selected_graph_speed, selected_graph_size)
-    # Create a white background for the graph area
-    x = SCREEN_WIDTH * 0.12
-    y = SCREEN_HEIGHT / 3
-    graph_bg = pygame.Surface((graph_width, graph_height))
-    graph_bg.fill(WHITE)
-    surface.blit(graph_bg, (x, y))
-    # Center the graph on the white background
-    graph_x = x + (graph_width - graph_surf.get_width()) // 2
-    graph_y = y + (graph_height - graph_surf.get_height()) // 2
-    surface.blit(graph_surf, (graph_x, graph_y))
-
-    # Draw back button
-    back_button.draw(surface)
-    return graph_surf
+
+# Menu screens, the draw functions above draw their static layer once and the widgets are drawn on top of it
+menu_screens = {
+    "main_menu": CachedScreen(draw_main_menu, [new_game_button, how_to_play_button, statistics_button]),
+    "game_setup": CachedScreen(draw_game_setup, [player_name_input, speed_dropdown, board_size_dropdown,
+                                                 start_game_button, back_to_menu_button]),
+    "game_over": CachedScreen(draw_game_over, [back_button]),
+    "game_won": CachedScreen(draw_game_won, [back_button]),
+    "how_to_play": CachedScreen(draw_how_to_play, [how_to_play_text, back_button]),
+    "statistics": CachedScreen(draw_statistics, [graph_view, graph_speed_dropdown, graph_size_dropdown,
+                                                 graph_type_dropdown, back_button, load_more_button])
+}
+last_drawn_screen = None
 
 
 def handle_menu_events(event, mouse_pos):
-    global selected_graph_speed, selected_graph_size, selected_graph_type, graph_surface, \
+    global selected_graph_speed, selected_graph_size, selected_graph_type, graph_requested, \
         selected_speed, selected_board_size, current_screen, player_name
     event_handled = False
 
@@ -385,113 +383,183 @@ def handle_menu_events(event, mouse_pos):
     # Statistics screen event handling
     elif current_screen == "statistics":
         back_button.check_hover(mouse_pos)
+        load_more_button.check_hover(mouse_pos)
 
         # Handle dropdown events
         if (graph_speed_dropdown.handle_event(mouse_pos, event) and
                 selected_graph_speed != graph_speed_dropdown.selected_option):
             selected_graph_speed = graph_speed_dropdown.selected_option
-            graph_surface = None
 
         if (graph_size_dropdown.handle_event(mouse_pos, event) and
                 selected_graph_size != graph_size_dropdown.selected_option):
             selected_graph_size = graph_size_dropdown.selected_option
-            graph_surface = None
 
         if (graph_type_dropdown.handle_event(mouse_pos, event) and
                 selected_graph_type != graph_type_dropdown.selected_option):
             selected_graph_type = graph_type_dropdown.selected_option
-            graph_surface = None
 
         if event.type == pygame.MOUSEBUTTONDOWN:
-            if back_button.is_clicked(mouse_pos, event):
+            if load_more_button.is_clicked(mouse_pos, event):
+                load_more_history(selected_graph_speed, selected_graph_size)
+            elif back_button.is_clicked(mouse_pos, event):
                 current_screen = "main_menu"
-                graph_surface = None
+                graph_worker.cancel()
+                graph_requested = None
 
     return event_handled
 
 
 # noinspection PyUnresolvedReferences
 def draw_menus():
-    global graph_surface
-    # Drawing the current screen
-    if current_screen == "main_menu":
-        draw_main_menu(screen)
-    elif current_screen == "game_setup":
-        draw_game_setup(screen)
-    elif current_screen == "game_over":
-        draw_game_over(screen, snake.score)
-    elif current_screen == "game_won":
-        draw_game_won(screen, snake.score)
-    elif current_screen == "how_to_play":
-        draw_how_to_play(screen)
-    elif current_screen == "statistics":
-        graph_surface = draw_statistics(screen, graph_surface)
-
-    pygame.display.flip()
+    global graph_requested, last_drawn_screen
+    # The game screen is drawn and pushed to the display by draw_objects
+    if current_screen == "game":
+        last_drawn_screen = current_screen
+        return
+
+    # Show the current graph from the cache, or the placeholder while the worker builds it
+    if current_screen == "statistics":
+        graph = graph_worker.poll()
+        if graph:
+            graph_cache[graph_requested] = graph_to_surface(graph, graph_size)
+            graph_requested = None
+
+        graph_key = (selected_graph_type, selected_graph_speed, selected_graph_size)
+        if graph_key not in graph_cache and graph_backend == "pygame":
+            # Native graphs take a few milliseconds, there's no need for the worker
+            graph_cache[graph_key] = generate_graph(*graph_key)
+
+        if graph_key in graph_cache:
+            graph_view.set_surface(graph_cache[graph_key])
+            if PREWARM_GRAPHS and graph_backend == "matplotlib" and graph_requested is None:
+                prewarm_graph(graph_key)
+        else:
+            graph_view.set_surface(graph_placeholder)
+            if graph_requested != graph_key:
+                # Replaces any graph still being built for an earlier selection
+                graph_worker.request(*graph_key, get_graph_data(*graph_key), graph_size)
+                graph_requested = graph_key
+
+        # Older scores can only be loaded into the score history, until there are none left
+        history = score_histories.get((selected_graph_speed, selected_graph_size))
+        load_more_button.set_visible(selected_graph_type == "Score vs Attempts" and history is not None
+                                     and not history.complete)
+
+    # Drawing the current screen, everything is redrawn when switching screens
+    menu_screen = menu_screens[current_screen]
+    if current_screen != last_drawn_screen:
+        # The game over screens show the score of the last game
+        menu_screen.invalidate(background=current_screen in ("game_over", "game_won"))
+        last_drawn_screen = current_screen
+
+    # Nothing is pushed to the display if nothing changed
+    update_display(menu_screen.draw(screen))
+
+
+def update_display(rects):
+    """Push only the given screen rects to the display, or the whole screen when most of it changed"""
+    if not rects:
+        return
+    if sum(rect.width * rect.height for rect in rects) > FULL_FLIP_AREA * SCREEN_WIDTH * SCREEN_HEIGHT:
+        pygame.display.flip()
+    else:
+        pygame.display.update(rects)
 
 
 # noinspection PyShadowingNames
-def draw_objects(screen, render_surface, snake, apple, board, init=False):
+def draw_objects(screen, render_surface, snake_renderer, apple_renderer, board_renderer, init=False, alpha=1.0):
+    snake = snake_renderer.snake
     if init:
         screen.fill(BACKGROUND_COLOR)
 
     # Render the board (grid lines, borders, etc.)
-    board.render(render_surface, init)
+    board_rects = board_renderer.render(render_surface, init)
+
+    # Render the snake
+    board_rects += snake_renderer.render(render_surface, alpha)
 
     # Render the apple
-    apple.render(render_surface)
+    board_rects += apple_renderer.render(render_surface)
+    board_renderer.render_border(render_surface)
 
-    # Render the snake
-    snake.render(render_surface)
-    board.render_border(render_surface)
-    screen.blit(render_surface, (board.start_x, board.start_y))
+    # Copy only the changed parts of the board to the screen
+    dirty_rects = []
+    for rect in board_rects:
+        rect = rect.clip(render_surface.get_rect())
+        screen_rect = rect.move(board_renderer.start_x, board_renderer.start_y)
+        screen.blit(render_surface, screen_rect, rect)
+        dirty_rects.append(screen_rect)
 
     # Display score if score has updated
     if snake.score_updated_this_frame:
-        font = pygame.font.SysFont(None, 36)
-        score_text = font.render(f'Score: {snake.score}', True, WHITE)
+        font = get_font(None, 36)
+        score_text = render_text(font, f'Score: {snake.score}', True, WHITE)
 
         # Clear the previous score and redraw new score
         width, height = score_text.get_width()+15, score_text.get_height()+15
         rect = pygame.Rect(10, 10, width, height)
         screen.fill(BACKGROUND_COLOR, rect=rect)
         screen.blit(score_text, rect.topleft)
+        dirty_rects.append(rect)
 
         snake.score_updated_this_frame = False
 
     # Update the display so that the rendered objects appear on the screen
-    pygame.display.flip()
+    if init:
+        pygame.display.flip()
+    else:
+        update_display(dirty_rects)
 
 
-def initialize_game(surface):
+def initialize_game(surface, replay=None):
     # Create a board
-    global render_surface, board, snake, apple, GRID_WIDTH, GRID_HEIGHT, GRID_SIZE
+    global render_surface, game, board_renderer, snake_renderer, apple_renderer, logic_clock, \
+        GRID_WIDTH, GRID_HEIGHT, GRID_SIZE, watching, replay_position
 
-    square_num = board_sizes_val[selected_board_size]
-    GRID_SIZE = max(SCREEN_WIDTH // square_num, SCREEN_HEIGHT * (4 / 5) // square_num)
-    GRID_WIDTH = SCREEN_WIDTH // GRID_SIZE
-    GRID_HEIGHT = int(SCREEN_HEIGHT * (4 / 5) // GRID_SIZE)
+    GRID_SIZE, GRID_WIDTH, GRID_HEIGHT = board_dimensions(selected_board_size, SCREEN_WIDTH, SCREEN_HEIGHT)
 
     render_surface = pygame.Surface((GRID_WIDTH * GRID_SIZE + 5, GRID_HEIGHT * GRID_SIZE + 5))
-    board = Board(GRID_WIDTH, GRID_HEIGHT, GRID_SIZE, 0, int(SCREEN_HEIGHT-GRID_HEIGHT*GRID_SIZE))
-
-    # Create a snake at the center of the board
-    snake = Snake(GRID_WIDTH // 2, GRID_HEIGHT // 2, GRID_SIZE, board, speeds_val[selected_speed])
-
-    # Create an apple at a random position
-    apple = Apple(board, GRID_SIZE)
-
-    draw_objects(surface, render_surface, snake, apple, board, True)
+    # The board, snake and apples live in the headless game, we only draw them here
+    # A replay sets the game up the same way as the recorded one and steers it
+    if replay is None:
+        game = Game(GRID_WIDTH, GRID_HEIGHT, seed=session_rng.randrange(2 ** 63))
+    else:
+        game = replay.new_game()
+    watching = replay
+    replay_position = 0
+    board_renderer = BoardRenderer(game.board, GRID_SIZE, 0, int(SCREEN_HEIGHT-GRID_HEIGHT*GRID_SIZE))
+    snake_renderer = SnakeRenderer(game.snake, GRID_SIZE, game.apple)
+    apple_renderer = AppleRenderer(game.apple, GRID_SIZE)
+    # The speed is the number of moves per second
+    logic_clock = FixedTimestep(speeds_val[selected_speed], MAX_CATCH_UP_TICKS)
+
+    draw_objects(surface, render_surface, snake_renderer, apple_renderer, board_renderer, True)
 
 
 # noinspection PyTypeChecker,PyUnresolvedReferences
-def game_loop():
+def game_loop(replay_score_id=None):
     # Setup database
-    global current_screen
-    conn, cursor = connect_database("snake_game.db")
+    global current_screen, selected_speed, selected_board_size, replay_position
+    with startup.timed("start score writer"):
+        score_writer = ScoreWriter("snake_game.db")
+
+    # Start by watching a saved game, at its normal speed
+    if replay_score_id is not None:
+        saved = get_replay(replay_score_id)
+        if saved:
+            try:
+                replay = Replay.from_bytes(saved[3])
+                selected_speed, selected_board_size = saved[:2]
+                current_screen = "game"
+                initialize_game(screen, replay)
+            except ValueError as e:
+                print(f"Can't play score {replay_score_id}: {e}")
+        else:
+            print(f"No replay saved for score {replay_score_id}")
 
     # Main game loop
     running = True
+    first_frame = True
     while running:
 
         # Control game speed
@@ -505,31 +573,64 @@ def game_loop():
             # Main menu event handling
             handle_menu_events(event, mouse_pos)
 
-            if current_screen == "game":
-                snake.handle_event(event)
+            if (current_screen == "game" and not watching and event.type == pygame.KEYDOWN and
+                    event.key in key_directions):
+                game.steer(*key_directions[event.key])
+
+        # Graphs and histories of game modes with newly saved scores are out of date
+        for snake_speed, board_size in score_writer.drain_committed():
+            score_histories.pop((snake_speed, board_size), None)
+            invalidate_graphs(snake_speed, board_size)
 
         draw_menus()
 
+        if first_frame:
+            first_frame = False
+            startup.mark("first frame")
+            if startup.enabled:
+                startup.report()
+
         if current_screen == "game":
-            # Update snake position
-            current_screen = snake.update(apple)
+            # Update snake position, running as many moves as the time since the last frame allows
+            for _ in range(logic_clock.advance(delta)):
+                if watching:
+                    replay_position = watching.steer(game, replay_position)
+                current_screen = game.step()
+                if current_screen != "game":
+                    break
+
+            # Play the sounds for whatever happened this frame
+            audio.post_all(game.drain_events())
+            audio.update()
 
             # Render all objects
-            draw_objects(screen, render_surface, snake, apple, board)
+            draw_objects(screen, render_surface, snake_renderer, apple_renderer, board_renderer,
+                         alpha=logic_clock.alpha)
 
-            if current_screen != "game":
-                # Save the score to database
-                save_score(cursor, conn, player_name, selected_speed, selected_board_size, snake.score)
-                clock.tick(1)
+            if current_screen != "game" and not watching:
+                # Save the score to database with a recording of the game, in the background
+                score_writer.save(player_name, selected_speed, selected_board_size, game.score,
+                                  Replay.from_game(game).to_bytes())
 
         elif current_screen == "game_setup":
             player_name_input.update(delta)
 
-    # Clean up and close
-    conn.close()
+    # Clean up and close, waiting for the last scores to be saved
+    score_writer.close()
     pygame.quit()
     sys.exit()
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Snake Game")
+    parser.add_argument("--replay", type=int, metavar="SCORE_ID", help="watch the recorded game behind a saved score")
+    parser.add_argument("--seed", type=int, help="seed the apple placements, the same seed gives the same games")
+    parser.add_argument("--startup-report", action="store_true", help="print how long startup took")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    game_loop()
+    args = parse_args()
+    if args.seed is not None:
+        session_rng.seed(args.seed)
+    game_loop(args.replay)
@@ -0,0 +1,60 @@
+# Plays saved games back without rendering, to check their scores or to time the game logic
+# Usage: python replay.py 42 57        (score ids)
+#        python replay.py --all
+# Watch a saved game at normal speed with: python main.py --replay 42
+import argparse
+import time
+from src.db_handler import get_connection, get_replay
+from src.replay import Replay, play
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Play saved games back as fast as possible and check their scores")
+    parser.add_argument("score_ids", type=int, nargs="*", help="ids of the scores to replay")
+    parser.add_argument("--all", action="store_true", help="replay every saved game")
+    parser.add_argument("--db", default="snake_game.db", help="database the games are saved in")
+    parser.add_argument("--max-ticks", type=int, default=1000000, help="give up on a game after this many moves")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    score_ids = args.score_ids
+    if args.all:
+        conn = get_connection(args.db)
+        score_ids = [row[0] for row in conn.execute("SELECT score_id FROM replays ORDER BY score_id")] if conn else []
+
+    print(f"{'Score id':>9}{'Saved':>8}{'Replayed':>10}{'Ticks':>9}{'Ticks/s':>11}  Result")
+    mismatches = 0
+    total_ticks = 0
+    start = time.perf_counter()
+    for score_id in score_ids:
+        saved = get_replay(score_id, args.db)
+        if saved is None:
+            print(f"{score_id:>9}{'':>8}{'':>10}{'':>9}{'':>11}  no replay")
+            continue
+
+        _, _, saved_score, data = saved
+        try:
+            replay = Replay.from_bytes(data)
+        except ValueError as e:
+            print(f"{score_id:>9}{saved_score:>8}{'':>10}{'':>9}{'':>11}  {e}")
+            continue
+
+        game_start = time.perf_counter()
+        game = play(replay, args.max_ticks)
+        elapsed = time.perf_counter() - game_start
+        total_ticks += game.ticks
+
+        matches = game.score == saved_score and game.state != "game"
+        mismatches += not matches
+        rate = game.ticks / elapsed if elapsed else 0
+        print(f"{score_id:>9}{saved_score:>8}{game.score:>10}{game.ticks:>9}{rate:>11.0f}  "
+              f"{'ok' if matches else 'MISMATCH'}")
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{len(score_ids)} games, {total_ticks} ticks in {elapsed:.2f}s, {mismatches} mismatches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Deferred loading of modules and sounds, so the window can appear before they are needed
+import importlib
+import sys
+import threading
+import pygame
+from src.startup import timed
+
+
+def load_module(name):
+    """Import a module the first time it is needed, timing the import"""
+    module = sys.modules.get(name)
+    if module is None:
+        with timed(f"import {name}"):
+            module = importlib.import_module(name)
+    return module
+
+
+class SoundBank:
+    def __init__(self, paths):
+        self.paths = paths  # Sound files by name
+        self.sounds = {}
+        self.lock = threading.Lock()
+
+    def get(self, name):
+        """The sound with the given name, loaded now if it isn't yet"""
+        sound = self.sounds.get(name)
+        if sound is None:
+            with self.lock:
+                sound = self.sounds.get(name)
+                if sound is None:
+                    with timed(f"sound {self.paths[name]}"):
+                        sound = self.sounds[name] = pygame.mixer.Sound(self.paths[name])
+        return sound
+
+    def preload(self):
+        """Load every sound in a background thread"""
+        thread = threading.Thread(target=self._load_all, name="sound-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def _load_all(self):
+        for name in self.paths:
+            try:
+                self.get(name)
+            except pygame.error:
+                pass  # Raised again when the sound is played, where it can be handled
@@ -0,0 +1,92 @@
+# Sound playback for game events, the game logic only raises events and never touches the mixer
+import time
+from collections import deque
+import pygame
+
+
+class NullBackend:
+    """Plays nothing, for headless runs and machines without an audio device"""
+    channels = 0
+
+    def is_busy(self, channel):
+        return False
+
+    def play(self, channel, name):
+        pass
+
+    def stop(self, channel):
+        pass
+
+
+class MixerBackend:
+    """Plays sounds from a SoundBank on a fixed pool of mixer channels"""
+    def __init__(self, sound_bank, channels=8):
+        self.sound_bank = sound_bank
+        self.channels = channels
+        pygame.mixer.set_num_channels(channels)
+        self.mixer_channels = [pygame.mixer.Channel(i) for i in range(channels)]
+
+    def is_busy(self, channel):
+        return self.mixer_channels[channel].get_busy()
+
+    def play(self, channel, name):
+        self.mixer_channels[channel].play(self.sound_bank.get(name))
+
+    def stop(self, channel):
+        self.mixer_channels[channel].stop()
+
+
+class AudioService:
+    def __init__(self, backend, priorities=None, min_intervals=None):
+        self.backend = backend
+        self.priorities = priorities or {}  # Higher priority sounds can cut off lower priority ones
+        self.min_intervals = min_intervals or {}  # Milliseconds before the same sound can play again
+        self.queue = deque()
+        self.last_played = {}  # When each sound last started
+
+        # What is playing on each channel, as (priority, start time)
+        self.playing = [None] * backend.channels
+        self.dropped = 0  # Events that were rate limited or found no channel
+
+    def post(self, name):
+        """Queue a sound event, it plays on the next update"""
+        self.queue.append(name)
+
+    def post_all(self, names):
+        self.queue.extend(names)
+
+    def update(self, now=None):
+        """Play the queued sound events, call once per frame"""
+        if now is None:
+            now = time.monotonic() * 1000
+        while self.queue:
+            self._play(self.queue.popleft(), now)
+
+    def _play(self, name, now):
+        # Rate limit, so bursts of the same event don't stack up
+        last = self.last_played.get(name)
+        if last is not None and now - last < self.min_intervals.get(name, 0):
+            self.dropped += 1
+            return
+
+        channel = self._find_channel(self.priorities.get(name, 0))
+        if channel is None:
+            self.dropped += 1
+            return
+
+        self.backend.play(channel, name)
+        self.playing[channel] = (self.priorities.get(name, 0), now)
+        self.last_played[name] = now
+
+    def _find_channel(self, priority):
+        # A free channel if there is one
+        for channel in range(len(self.playing)):
+            if self.playing[channel] is None or not self.backend.is_busy(channel):
+                return channel
+
+        # Otherwise steal the oldest of the lowest priority sounds, as long as it isn't more important than this one
+        victim = min(range(len(self.playing)), key=lambda channel: self.playing[channel], default=None)
+        if victim is None or self.playing[victim][0] > priority:
+            return None
+        self.backend.stop(victim)
+        return victim
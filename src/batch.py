@@ -0,0 +1,172 @@
+# Vectorized simulator that steps many independent games at once with NumPy
+# Follows the same rules as src/snake.py, but without the input queue: each game takes one action per tick
+import numpy as np
+from src.grid import EMPTY, SNAKE, APPLE
+from src.rules import rules as default_rules
+
+# Directions, indexed by action code
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DX = np.array([0, 0, -1, 1], dtype=np.int64)
+DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.int64)
+
+# Game states returned by step
+PLAYING, GAME_OVER, GAME_WON = 0, 1, 2
+
+
+class BatchGame:
+    def __init__(self, n, width, height, rules=default_rules, seed=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        self.square_num = width * height
+        self.wrap = rules["on_wall_collision"] == "T"
+        self.apple_count = rules["apple_count"]
+        self.rng = np.random.default_rng(seed)
+
+        # Scoring constants, same as Snake
+        self.TIME_BONUS = round((self.square_num ** 0.5) * 0.4, 1)
+        self.time_bonus_factor = 0.9 / self.square_num
+
+        # One flat grid per game, 0 = empty, 1 = snake, 2 = apple
+        self.grid = np.zeros((n, self.square_num), dtype=np.uint8)
+
+        # Snake bodies are ring buffers of flat cell indices, the head is at body[i, head_ptr[i]]
+        # and the tail length[i] - 1 slots behind it
+        self.body = np.zeros((n, self.square_num), dtype=np.int32)
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.length = np.zeros(n, dtype=np.int64)
+
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.growth_pending = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.time_bonus = np.zeros(n, dtype=np.float64)
+        self.ticks = np.zeros(n, dtype=np.int64)
+
+        self.reset(np.arange(n))
+
+    def reset(self, games):
+        """Start a fresh game in each of the given slots"""
+        games = np.asarray(games, dtype=np.int64)
+        if not games.size:
+            return
+
+        self.grid[games] = EMPTY
+        start = (self.height // 2) * self.width + self.width // 2
+        self.body[games, 0] = start
+        self.grid[games, start] = SNAKE
+        self.head_ptr[games] = 0
+        self.length[games] = 1
+        self.direction[games] = RIGHT  # Start moving right
+        self.growth_pending[games] = 0
+        self.score[games] = 0
+        self.time_bonus[games] = 0.0
+        self.ticks[games] = 0
+
+        for _ in range(self.apple_count):
+            self.spawn_apples(games)
+
+    def spawn_apples(self, games):
+        """Place one apple on a uniformly random empty cell of each given game"""
+        # Rejection sampling is enough while the boards are mostly empty
+        pending = games
+        for _ in range(4):
+            if not pending.size:
+                return
+            cells = self.rng.integers(0, self.square_num, pending.size)
+            free = self.grid[pending, cells] == EMPTY
+            self.grid[pending[free], cells[free]] = APPLE
+            pending = pending[~free]
+
+        if not pending.size:
+            return
+
+        # Crowded boards: pick the empty cell with the largest random key
+        keys = self.rng.random((pending.size, self.square_num))
+        free = self.grid[pending] == EMPTY
+        keys[~free] = -1.0
+        cells = keys.argmax(axis=1)
+
+        # If there are no empty spaces, the game should be over anyway
+        has_free = free.any(axis=1)
+        self.grid[pending[has_free], cells[has_free]] = APPLE
+
+    def step(self, actions=None):
+        """Advance every game by one tick
+        actions is an optional array of direction codes (UP, DOWN, LEFT, RIGHT), -1 keeps the current direction
+        Returns (states, scores), the state and score of each game before finished games are reset"""
+        n = self.n
+        games = np.arange(n)
+        states = np.full(n, PLAYING, dtype=np.int8)
+
+        # Steer, ignoring turns back onto the snake itself
+        if actions is not None:
+            actions = np.asarray(actions, dtype=np.int64)
+            turn = (actions >= 0) & (actions != OPPOSITE[self.direction])
+            self.direction[turn] = actions[turn]
+
+        # Calculate new head position
+        head = self.body[games, self.head_ptr].astype(np.int64)
+        new_x = head % self.width + DX[self.direction]
+        new_y = head // self.width + DY[self.direction]
+
+        # Check if snakes hit the wall
+        if self.wrap:
+            new_x %= self.width
+            new_y %= self.height
+        else:
+            hit_wall = (new_x < 0) | (new_x >= self.width) | (new_y < 0) | (new_y >= self.height)
+            states[hit_wall] = GAME_OVER
+            new_x = np.clip(new_x, 0, self.width - 1)
+            new_y = np.clip(new_y, 0, self.height - 1)
+        new_head = new_y * self.width + new_x
+
+        alive = states == PLAYING
+        a = games[alive]
+        new_head_a = new_head[alive]
+
+        # Check if snakes ate an apple
+        ate = self.grid[a, new_head_a] == APPLE
+        eaters = a[ate]
+        self.score[eaters] += 10 + np.round(self.time_bonus[eaters]).astype(np.int64) * 5
+        self.time_bonus[eaters] = np.minimum(self.score[eaters] * self.time_bonus_factor, self.TIME_BONUS)
+        self.growth_pending[eaters] += 1
+
+        # Remove tails if not growing
+        growing = self.growth_pending[a] > 0
+        self.growth_pending[a[growing]] -= 1
+        shrink = a[~growing]
+        tail_ptr = (self.head_ptr[shrink] - self.length[shrink] + 1) % self.square_num
+        self.grid[shrink, self.body[shrink, tail_ptr]] = EMPTY
+        self.length[shrink] -= 1
+
+        # Check if snakes hit themselves, the tail has already moved out of the way
+        hit_self = self.grid[a, new_head_a] == SNAKE
+        states[a[hit_self]] = GAME_OVER
+        moving = ~hit_self
+        a = a[moving]
+        new_head_a = new_head_a[moving]
+        ate = ate[moving]
+
+        # Add the new heads
+        self.head_ptr[a] = (self.head_ptr[a] + 1) % self.square_num
+        self.body[a, self.head_ptr[a]] = new_head_a
+        self.grid[a, new_head_a] = SNAKE
+        self.length[a] += 1
+
+        # Check if the snakes have filled up their boards
+        won = self.length[a] >= self.square_num
+        states[a[won]] = GAME_WON
+
+        # Respawn eaten apples
+        self.spawn_apples(a[ate & ~won])
+
+        bonus = a[~won]
+        bonus = bonus[self.time_bonus[bonus] >= 0]
+        self.time_bonus[bonus] -= 0.06
+        self.ticks[a] += 1
+
+        # Reset finished games so every slot is always playing
+        scores = self.score.copy()
+        self.reset(games[states != PLAYING])
+        return states, scores
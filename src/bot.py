@@ -0,0 +1,51 @@
+# Simple greedy bot for headless games
+import random
+from src.grid import SNAKE
+
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+
+def greedy_action(game, rng=random):
+    """Pick the safe direction that gets the snake closest to an apple
+    Returns None to keep going straight when no direction is safe"""
+    snake = game.snake
+    board = game.board
+    head_x, head_y = snake.segments[0]
+    wrap = snake.rules["on_wall_collision"] == "T"
+
+    best = []
+    best_distance = None
+    for dx, dy in DIRECTIONS:
+        # Never turn back onto the snake itself
+        if (dx, dy) == (-snake.direction[0], -snake.direction[1]):
+            continue
+
+        x, y = head_x + dx, head_y + dy
+        if wrap:
+            x %= board.width
+            y %= board.height
+        elif not board.grid.in_bounds(x, y):
+            continue
+
+        if board.grid.get(x, y) == SNAKE:
+            continue
+
+        distance = min(_distance(board, wrap, x, y, apple_x, apple_y) for apple_x, apple_y in game.apple.positions) \
+            if game.apple.positions else 0
+        if best_distance is None or distance < best_distance:
+            best, best_distance = [(dx, dy)], distance
+        elif distance == best_distance:
+            best.append((dx, dy))
+
+    if not best:
+        return None
+    return rng.choice(best)
+
+
+def _distance(board, wrap, x1, y1, x2, y2):
+    dx = abs(x1 - x2)
+    dy = abs(y1 - y2)
+    if wrap:
+        dx = min(dx, board.width - dx)
+        dy = min(dy, board.height - dy)
+    return dx + dy
@@ -0,0 +1,144 @@
+# Bar and line charts drawn straight onto a pygame surface, a light alternative to matplotlib for the statistics graphs
+import math
+import pygame
+from src.text import get_font, render_text
+
+AXIS_COLOR = (0, 0, 0)
+GRID_COLOR = (225, 225, 225)
+TEXT_COLOR = (0, 0, 0)
+
+
+def nice_ticks(low, high, count=5):
+    """Round tick values covering low to high, about count of them"""
+    if high <= low:
+        high = low + 1
+    raw_step = (high - low) / count
+    magnitude = 10 ** math.floor(math.log10(raw_step))
+    # Smallest of 1, 2, 2.5, 5 and 10 times a power of ten that is at least the raw step
+    step = next(factor * magnitude for factor in (1, 2, 2.5, 5, 10) if factor * magnitude >= raw_step)
+
+    first = math.floor(low / step)
+    last = math.ceil(high / step)
+    return [i * step for i in range(first, last + 1)]
+
+
+def downsample(xs, ys, buckets):
+    """Keep the lowest and highest point of each of the given number of equal runs of points, in order
+    The line drawn through them looks the same as the full one when there are fewer buckets than points."""
+    if len(xs) <= buckets * 2:
+        return xs, ys
+
+    sampled_xs = []
+    sampled_ys = []
+    for bucket in range(buckets):
+        start = len(xs) * bucket // buckets
+        end = len(xs) * (bucket + 1) // buckets
+        low = min(range(start, end), key=ys.__getitem__)
+        high = max(range(start, end), key=ys.__getitem__)
+        for i in sorted({low, high}):
+            sampled_xs.append(xs[i])
+            sampled_ys.append(ys[i])
+    return sampled_xs, sampled_ys
+
+
+def _tick_label(value):
+    return str(int(value)) if value == int(value) else f"{value:g}"
+
+
+class Chart:
+    def __init__(self, surface, title, ylabel):
+        self.surface = surface
+        self.title_font = get_font(None, 22)
+        self.label_font = get_font(None, 18)
+
+        # Title centred at the top
+        width, height = surface.get_size()
+        title = render_text(self.title_font, title, True, TEXT_COLOR)
+        surface.blit(title, title.get_rect(midtop=(width // 2, 6)))
+
+        # y axis label running up the left side
+        self.ylabel = pygame.transform.rotate(render_text(self.label_font, ylabel, True, TEXT_COLOR), 90)
+        self.top = title.get_height() + 14
+
+    def layout(self, y_ticks, bottom_margin):
+        """Work out the plot area, leaving room for the y tick labels and bottom_margin below"""
+        width, height = self.surface.get_size()
+        tick_width = max(self.label_font.size(_tick_label(tick))[0] for tick in y_ticks)
+        left = 8 + self.ylabel.get_width() + 6 + tick_width + 6
+        self.plot = pygame.Rect(left, self.top, width - left - 14, height - self.top - bottom_margin)
+        self.y_low, self.y_high = y_ticks[0], y_ticks[-1]
+
+        self.surface.blit(self.ylabel, self.ylabel.get_rect(midleft=(8, self.plot.centery)))
+
+        # Horizontal grid lines and y ticks
+        for tick in y_ticks:
+            y = self.y_to_pixel(tick)
+            if self.plot.top < y < self.plot.bottom:
+                pygame.draw.line(self.surface, GRID_COLOR, (self.plot.left + 1, y), (self.plot.right - 1, y))
+            pygame.draw.line(self.surface, AXIS_COLOR, (self.plot.left - 4, y), (self.plot.left, y))
+            label = render_text(self.label_font, _tick_label(tick), True, TEXT_COLOR)
+            self.surface.blit(label, label.get_rect(midright=(self.plot.left - 6, y)))
+
+    def y_to_pixel(self, value):
+        return round(self.plot.bottom - (value - self.y_low) / (self.y_high - self.y_low) * self.plot.height)
+
+    def draw_axes(self):
+        pygame.draw.rect(self.surface, AXIS_COLOR, self.plot, 1)
+
+
+def bar_chart(surface, labels, values, title, ylabel, color):
+    """Bars for each value, with its label rotated under it"""
+    chart = Chart(surface, title, ylabel)
+    font = chart.label_font
+
+    # Labels are rotated 45 degrees, so the bottom margin has to fit the longest one
+    rotated = [pygame.transform.rotate(render_text(font, str(label), True, TEXT_COLOR), 45) for label in labels]
+    bottom_margin = max((label.get_height() for label in rotated), default=0) + 10
+    bottom_margin = min(bottom_margin, surface.get_height() // 2)
+    chart.layout(nice_ticks(0, max(values)), bottom_margin)
+
+    slot = chart.plot.width / len(values)
+    for i, (value, label) in enumerate(zip(values, rotated)):
+        x = chart.plot.left + slot * i
+        top = chart.y_to_pixel(value)
+        pygame.draw.rect(surface, color, (round(x + slot * 0.1), top, max(1, round(slot * 0.8)),
+                                          chart.plot.bottom - top))
+
+        # Right end of the label just under the middle of its bar
+        center = round(x + slot / 2)
+        pygame.draw.line(surface, AXIS_COLOR, (center, chart.plot.bottom), (center, chart.plot.bottom + 3))
+        surface.blit(label, label.get_rect(topright=(center + 4, chart.plot.bottom + 4)))
+
+    chart.draw_axes()
+
+
+def line_chart(surface, xs, ys, title, ylabel, color):
+    """A line through the points, with a marker on each"""
+    chart = Chart(surface, title, ylabel)
+    font = chart.label_font
+    chart.layout(nice_ticks(min(ys), max(ys)), font.get_height() + 12)
+
+    x_ticks = nice_ticks(min(xs), max(xs))
+    x_low, x_high = x_ticks[0], x_ticks[-1]
+
+    def x_to_pixel(value):
+        return round(chart.plot.left + (value - x_low) / (x_high - x_low) * chart.plot.width)
+
+    # x ticks
+    for tick in x_ticks:
+        x = x_to_pixel(tick)
+        pygame.draw.line(surface, AXIS_COLOR, (x, chart.plot.bottom), (x, chart.plot.bottom + 4))
+        label = render_text(font, _tick_label(tick), True, TEXT_COLOR)
+        surface.blit(label, label.get_rect(midtop=(x, chart.plot.bottom + 6)))
+
+    # No point drawing more than a couple of points per pixel column
+    xs, ys = downsample(xs, ys, chart.plot.width)
+    points = [(x_to_pixel(x), chart.y_to_pixel(y)) for x, y in zip(xs, ys)]
+    if len(points) > 1:
+        pygame.draw.lines(surface, color, False, points, 2)
+    # Markers only while they don't run into each other
+    if len(points) <= chart.plot.width // 8:
+        for point in points:
+            pygame.draw.circle(surface, color, point, 4)
+
+    chart.draw_axes()
@@ -1,8 +1,13 @@
 # To handle game rules, assets etc
 import pygame
+from src.rules import *
+from src.assets import SoundBank
+from src.startup import timed
+from src.text import LazyFont
 
 # Initialise pygame
-pygame.init()
+with timed("pygame.init"):
+    pygame.init()
 
 # Colors
 WHITE = (255, 255, 255)
@@ -23,48 +28,22 @@ board_bg_color = DARKER_GREEN
 board_grid_color = DARK_GREEN
 board_border_color = DARKEST_GREEN
 
-# Font
-title_font = pygame.font.SysFont("comicsansms", 60)
-large_font = pygame.font.SysFont("comicsansms", 36)
-medium_font = pygame.font.SysFont("comicsansms", 24)
-small_font = pygame.font.SysFont("comicsansms", 18)
-
-# Sounds
-apple_eaten = pygame.mixer.Sound("Assets/apple_eaten.wav")
-collision = pygame.mixer.Sound("Assets/collision.wav")
-turn = pygame.mixer.Sound("Assets/turn.wav")
+# Font, looked up the first time they are drawn with
+title_font = LazyFont("comicsansms", 60)
+large_font = LazyFont("comicsansms", 36)
+medium_font = LazyFont("comicsansms", 24)
+small_font = LazyFont("comicsansms", 18)
+
+# Sounds by game event, loaded when first played or by sounds.preload()
+sounds = SoundBank({
+    "apple_eaten": "Assets/apple_eaten.wav",
+    "collision": "Assets/collision.wav",
+    "turn": "Assets/turn.wav",
+})
+sound_channels = 8
+sound_priorities = {"collision": 2, "apple_eaten": 1, "turn": 0}
+sound_min_intervals = {"turn": 40}  # Milliseconds, stops quick key presses from stacking up turn sounds
 
 # Game modes and Graphs
 graph_types = ["Score vs Player", "Score vs Attempts"]
-
-speeds = ["Slow", "Medium", "Fast"]
-speeds_val = {
-    "Slow": 4,
-    "Medium": 6,
-    "Fast": 10
-}
-board_sizes = ["Small", "Medium", "Large"]
-board_sizes_val = {
-    "Small": 10,
-    "Medium": 15,
-    "Large": 20
-}
-
-# Rules
-rules = {
-    # Can take values E for End, T for Teleport (to the other end of the board),
-    "on_wall_collision": "T"
-}
-
-# Sql queries
-player_by_score_query = """SELECT id, player_name, score
-FROM scores
-WHERE snake_speed = 'Slow' AND board_size = 'Small'
-AND (player_name, score) IN (
-    SELECT player_name, MAX(score)
-    FROM scores
-    WHERE snake_speed = 'Slow' AND board_size = 'Small'
-    GROUP BY player_name
-    )
-ORDER BY score DESC
-LIMIT 100;"""
+graph_backend = "pygame"  # "pygame" draws the graphs in a few milliseconds, "matplotlib" looks nicer but is much slower
@@ -1,24 +1,223 @@
+import queue
 import sqlite3
+import threading
+from collections import deque
+from itertools import islice
+
+DB_PATH = "snake_game.db"
+
+# Bumped whenever the schema changes, stored in the database file as PRAGMA user_version
+# 0 is the original single scores table with the player name and game mode as text on every row
+SCHEMA_VERSION = 2
+
+# STRICT tables need SQLite 3.37, older versions get the same tables without the type checks
+STRICT = " STRICT" if sqlite3.sqlite_version_info >= (3, 37, 0) else ""
+
+# Players and game modes are stored once and scores point at them by id, so every score row and index
+# entry is a few integers and filtering by mode compares integers instead of strings
+SCHEMA = [
+    f"""
+    CREATE TABLE players (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    ){STRICT}""",
+    f"""
+    CREATE TABLE modes (
+        id INTEGER PRIMARY KEY,
+        snake_speed TEXT NOT NULL,
+        board_size TEXT NOT NULL,
+        UNIQUE (snake_speed, board_size)
+    ){STRICT}""",
+    f"""
+    CREATE TABLE scores (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        player_id INTEGER NOT NULL REFERENCES players,
+        mode_id INTEGER NOT NULL REFERENCES modes,
+        score INTEGER NOT NULL,
+        date TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    ){STRICT}""",
+
+    # Score history of a game mode in date order, and the scores of each player in a game mode
+    "CREATE INDEX scores_by_mode_date ON scores (mode_id, date)",
+    "CREATE INDEX scores_by_mode_player ON scores (mode_id, player_id, score)",
+
+    # Each player's best score in each game mode, kept up to date by a trigger on scores so the leaderboard
+    # is a range read of an index instead of a grouped scan of every score
+    f"""
+    CREATE TABLE best_scores (
+        mode_id INTEGER NOT NULL,
+        player_id INTEGER NOT NULL,
+        score INTEGER NOT NULL,
+        score_id INTEGER NOT NULL,
+        PRIMARY KEY (mode_id, player_id)
+    ){STRICT}{"," if STRICT else ""} WITHOUT ROWID""",
+    "CREATE INDEX best_scores_by_mode_score ON best_scores (mode_id, score)",
+    """
+    CREATE TRIGGER update_best_scores AFTER INSERT ON scores
+    BEGIN
+        INSERT INTO best_scores (mode_id, player_id, score, score_id)
+        VALUES (NEW.mode_id, NEW.player_id, NEW.score, NEW.id)
+        ON CONFLICT (mode_id, player_id)
+        DO UPDATE SET score = excluded.score, score_id = excluded.score_id
+        WHERE excluded.score > best_scores.score;
+    END""",
+]
+
+# Statements that bring the schema up to each version from the one before
+UPGRADES = {
+    # Recording of the game behind a score, see src/replay.py for the format
+    2: [f"""
+    CREATE TABLE replays (
+        score_id INTEGER PRIMARY KEY REFERENCES scores,
+        data BLOB NOT NULL
+    ){STRICT}"""],
+}
+
+# Moves a version 0 database out of the way before the new schema is created...
+MIGRATE_FROM_0_BEFORE = [
+    "DROP TRIGGER IF EXISTS update_best_scores",
+    "DROP TABLE IF EXISTS best_scores",
+    "DROP INDEX IF EXISTS scores_by_mode_date",
+    "DROP INDEX IF EXISTS scores_by_mode_player",
+    "ALTER TABLE scores RENAME TO old_scores",
+]
+
+# ...then copies it across, keeping the score ids, and the trigger fills in best_scores
+# Version 0 columns could all be NULL, rows without a game mode are kept under this one
+UNKNOWN_MODE = "Unknown"
+MIGRATE_FROM_0_AFTER = [
+    "INSERT INTO players (name) SELECT DISTINCT COALESCE(player_name, 'Player') FROM old_scores",
+    f"""
+    INSERT INTO modes (snake_speed, board_size)
+    SELECT DISTINCT COALESCE(snake_speed, '{UNKNOWN_MODE}'), COALESCE(board_size, '{UNKNOWN_MODE}') FROM old_scores""",
+    f"""
+    INSERT INTO scores (id, player_id, mode_id, score, date)
+    SELECT old_scores.id, players.id, modes.id, CAST(COALESCE(old_scores.score, 0) AS INTEGER),
+           COALESCE(old_scores.date, CURRENT_TIMESTAMP)
+    FROM old_scores
+    JOIN players ON players.name = COALESCE(old_scores.player_name, 'Player')
+    JOIN modes ON modes.snake_speed = COALESCE(old_scores.snake_speed, '{UNKNOWN_MODE}')
+              AND modes.board_size = COALESCE(old_scores.board_size, '{UNKNOWN_MODE}')
+    ORDER BY old_scores.id""",
+    "DROP TABLE old_scores",
+]
+
+# Queries are constant strings with ? parameters, so sqlite3 reuses their prepared statements
+MODE_ID = "(SELECT id FROM modes WHERE snake_speed = ? AND board_size = ?)"
+
+BEST_SCORES_QUERY = f"""
+SELECT best_scores.score_id, players.name, best_scores.score
+FROM best_scores
+JOIN players ON players.id = best_scores.player_id
+WHERE best_scores.mode_id = {MODE_ID}
+ORDER BY best_scores.score DESC
+LIMIT 100"""
+
+RECENT_SCORES_QUERY = f"""
+SELECT scores.id, players.name, scores.score
+FROM scores
+JOIN players ON players.id = scores.player_id
+WHERE scores.mode_id = {MODE_ID}
+ORDER BY scores.date DESC
+LIMIT 100"""
+
+# Score history pages, newest first, each page starts after the (date, id) of the last row of the previous one
+# so it is an index range read however far back it goes, unlike OFFSET
+HISTORY_FIRST_PAGE = f"""
+SELECT scores.id, players.name, scores.score, scores.date
+FROM scores
+JOIN players ON players.id = scores.player_id
+WHERE scores.mode_id = {MODE_ID}
+ORDER BY scores.date DESC, scores.id DESC
+LIMIT ?"""
+
+HISTORY_NEXT_PAGE = f"""
+SELECT scores.id, players.name, scores.score, scores.date
+FROM scores
+JOIN players ON players.id = scores.player_id
+WHERE scores.mode_id = {MODE_ID} AND (scores.date, scores.id) < (?, ?)
+ORDER BY scores.date DESC, scores.id DESC
+LIMIT ?"""
+
+# Scores are saved by name, new players and modes are added first
+INSERT_PLAYER = "INSERT OR IGNORE INTO players (name) VALUES (?)"
+INSERT_MODE = "INSERT OR IGNORE INTO modes (snake_speed, board_size) VALUES (?, ?)"
+INSERT_SCORE = """
+INSERT INTO scores (player_id, mode_id, score)
+SELECT players.id, modes.id, ?
+FROM players, modes
+WHERE players.name = ? AND modes.snake_speed = ? AND modes.board_size = ?"""
+INSERT_REPLAY = "INSERT INTO replays (score_id, data) VALUES (?, ?)"
+
+REPLAY_QUERY = """
+SELECT modes.snake_speed, modes.board_size, scores.score, replays.data
+FROM replays
+JOIN scores ON scores.id = replays.score_id
+JOIN modes ON modes.id = scores.mode_id
+WHERE replays.score_id = ?"""
+
+# Paths whose schema has been set up by this process
+_schema_ready = set()
+_schema_lock = threading.Lock()
+
+# Long lived connections of each thread, by path, sqlite3 connections can't be shared between threads
+_local = threading.local()
+
+
+def _setup_schema(conn, path):
+    """Create the schema, or bring an older one up to date, once per database per process"""
+    with _schema_lock:
+        if path in _schema_ready:
+            return
+
+        migrated = False
+        conn.isolation_level = None  # The transaction is managed here, so the version check and upgrade are atomic
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version > SCHEMA_VERSION:
+                raise sqlite3.DatabaseError(f"{path} has schema version {version}, this game only knows up to "
+                                            f"{SCHEMA_VERSION}")
+
+            if version == 0:
+                # A version 0 database with a scores table has to be migrated, otherwise it is a new one
+                migrated = bool(conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'scores'").fetchone())
+                statements = SCHEMA
+                if migrated:
+                    statements = MIGRATE_FROM_0_BEFORE + SCHEMA + MIGRATE_FROM_0_AFTER
+                for statement in statements:
+                    conn.execute(statement)
+                version = 1
+
+            if version < SCHEMA_VERSION:
+                for upgrade in range(version + 1, SCHEMA_VERSION + 1):
+                    for statement in UPGRADES[upgrade]:
+                        conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.isolation_level = ""
+
+        # Give the space of the old rows back to the file system
+        if migrated:
+            conn.execute("VACUUM")
+        _schema_ready.add(path)
 
 
 # Connection to the database
-def connect_database(path):
+def connect_database(path=DB_PATH):
+    """Open a new connection that the caller owns and closes, returns (conn, cursor) or (None, None)"""
     conn = None
     try:
         conn = sqlite3.connect(path)
-        # Create the scores table if it doesn't exist
+        # Readers don't block the writer and commits don't have to wait for every fsync
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        _setup_schema(conn, path)
         cursor = conn.cursor()
-        cursor.execute('''
-        CREATE TABLE IF NOT EXISTS scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            player_name TEXT,
-            snake_speed TEXT,
-            board_size TEXT,
-            score INTEGER,
-            date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-        ''')
-        conn.commit()
     except sqlite3.Error as e:
         print(f"Database error: {e}")
         if conn:
@@ -29,38 +228,30 @@ def connect_database(path):
     return conn, cursor
 
 
+def get_connection(path=DB_PATH):
+    """The calling thread's shared connection, opened on first use and kept open, or None if it can't be opened"""
+    connections = _local.__dict__.setdefault("connections", {})
+    conn = connections.get(path)
+    if conn is None:
+        conn, _ = connect_database(path)
+        if conn:
+            connections[path] = conn
+    return conn
+
+
 # Function to get data from the database
-def get_scores_data(snake_speed="Slow", board_size="Small", group_by_player_name=False):
-    conn, cursor = connect_database("snake_game.db")
+def get_scores_data(snake_speed="Slow", board_size="Small", group_by_player_name=False, path=DB_PATH):
+    conn = get_connection(path)
     if not conn:
         print("No connection")
         return [], [], []
 
     try:
         if group_by_player_name:
-            query = f"""
-            SELECT id, player_name, score
-            FROM scores
-            WHERE snake_speed = '{snake_speed}' AND board_size = '{board_size}'
-            AND (player_name, score) IN (
-                SELECT player_name, MAX(score)
-                FROM scores
-                WHERE snake_speed = '{snake_speed}' AND board_size = '{board_size}'
-                GROUP BY player_name
-                )
-            ORDER BY score DESC
-            LIMIT 100;"""
+            rows = conn.execute(BEST_SCORES_QUERY, (snake_speed, board_size)).fetchall()
         else:
-            query = f"""
-            SELECT id, player_name, score
-            FROM scores
-            WHERE snake_speed = '{snake_speed}' AND board_size = '{board_size}'
-            ORDER BY date DESC
-            LIMIT 100"""
-
-        cursor.execute(query)
+            rows = conn.execute(RECENT_SCORES_QUERY, (snake_speed, board_size)).fetchall()
 
-        rows = cursor.fetchall()
         ids = [row[0] for row in rows]
         player_names = [row[1] for row in rows]
         scores = [row[2] for row in rows]
@@ -70,12 +261,157 @@ def get_scores_data(snake_speed="Slow", board_size="Small", group_by_player_name
         print(f"Query error: {e}")
         return [], [], []
 
-    finally:
-        conn.close()
 
+def iter_scores(snake_speed, board_size, chunk_size=100, path=DB_PATH):
+    """Every score of a game mode as (id, player_name, score), newest first, read from the database a chunk at a time"""
+    conn = get_connection(path)
+    if not conn:
+        print("No connection")
+        return
+
+    try:
+        rows = conn.execute(HISTORY_FIRST_PAGE, (snake_speed, board_size, chunk_size)).fetchall()
+        while rows:
+            for score_id, player_name, score, _ in rows:
+                yield score_id, player_name, score
+            if len(rows) < chunk_size:
+                return
+            last_id, _, _, last_date = rows[-1]
+            rows = conn.execute(HISTORY_NEXT_PAGE, (snake_speed, board_size, last_date, last_id, chunk_size)).fetchall()
 
-def save_score(cursor, conn, player_name, snake_speed, board_size, score):
-    cursor.execute('INSERT INTO scores (player_name, score, snake_speed, board_size) VALUES (?, ?, ?, ?)',
-                   (player_name, score, snake_speed, board_size))
+    except sqlite3.Error as e:
+        print(f"Query error: {e}")
+
+
+class ScoreHistory:
+    """Score history of a game mode, newest first, loaded as far back as asked for"""
+    def __init__(self, snake_speed, board_size, chunk_size=100, path=DB_PATH):
+        self.chunk_size = chunk_size
+        self.rows = iter_scores(snake_speed, board_size, chunk_size, path)
+        self.ids = []
+        self.player_names = []
+        self.scores = []
+        self.complete = False  # Everything has been loaded
+
+    def load_more(self, count=None):
+        """Load up to count more scores, a chunk by default, returns how many were loaded"""
+        count = count or self.chunk_size
+        rows = list(islice(self.rows, count))
+        if len(rows) < count:
+            self.complete = True
+
+        for score_id, player_name, score in rows:
+            self.ids.append(score_id)
+            self.player_names.append(player_name)
+            self.scores.append(score)
+        return len(rows)
+
+
+def _insert_scores(cursor, rows):
+    """Insert (player_name, snake_speed, board_size, score, replay) rows, replay is optional and can be None"""
+    cursor.executemany(INSERT_PLAYER, {(row[0],) for row in rows})
+    cursor.executemany(INSERT_MODE, {(row[1], row[2]) for row in rows})
+
+    # Scores with replays need their score ids, the rest are inserted in one go
+    plain = []
+    for player_name, snake_speed, board_size, score, *replay in rows:
+        if replay and replay[0] is not None:
+            cursor.execute(INSERT_SCORE, (score, player_name, snake_speed, board_size))
+            cursor.execute(INSERT_REPLAY, (cursor.lastrowid, replay[0]))
+        else:
+            plain.append((score, player_name, snake_speed, board_size))
+    cursor.executemany(INSERT_SCORE, plain)
+
+
+def save_score(cursor, conn, player_name, snake_speed, board_size, score, replay=None):
+    """replay is the bytes of a recording of the game, from Replay.to_bytes"""
+    _insert_scores(cursor, [(player_name, snake_speed, board_size, score, replay)])
     conn.commit()
-    cursor.execute('SELECT * FROM scores')
+
+
+def get_replay(score_id, path=DB_PATH):
+    """(snake_speed, board_size, score, replay bytes) of a score, or None if it has no replay"""
+    conn = get_connection(path)
+    if not conn:
+        print("No connection")
+        return None
+
+    try:
+        return conn.execute(REPLAY_QUERY, (score_id,)).fetchone()
+    except sqlite3.Error as e:
+        print(f"Query error: {e}")
+        return None
+
+
+def save_scores(cursor, conn, rows):
+    """Insert many (player_name, snake_speed, board_size, score) rows in a single transaction
+    Rows can have the bytes of a replay as a fifth item"""
+    with conn:
+        _insert_scores(cursor, rows)
+
+
+class ScoreWriter:
+    """Saves scores on a background thread, so the game never waits on the disk
+    Scores queued while a commit is running are saved together in the next one."""
+    def __init__(self, path=DB_PATH, max_batch=500):
+        self.path = path
+        self.max_batch = max_batch
+        self.queue = queue.Queue()
+        self.committed = deque()  # (snake_speed, board_size) of every saved score, read with drain_committed
+        self.thread = threading.Thread(target=self._run, name="score-writer", daemon=True)
+        self.thread.start()
+
+    def save(self, player_name, snake_speed, board_size, score, replay=None):
+        self.queue.put((player_name, snake_speed, board_size, score, replay))
+
+    def flush(self):
+        """Wait until every queued score is saved"""
+        self.queue.join()
+
+    def close(self):
+        """Save whatever is still queued and stop the thread"""
+        self.queue.put(None)
+        self.thread.join()
+
+    def drain_committed(self):
+        """Return and clear the game modes that have had scores saved since the last call"""
+        modes = []
+        while self.committed:
+            modes.append(self.committed.popleft())
+        return modes
+
+    def _run(self):
+        conn, cursor = connect_database(self.path)
+        running = True
+        while running:
+            # Wait for a score, then take every other one already queued
+            rows = [self.queue.get()]
+            while len(rows) < self.max_batch:
+                try:
+                    rows.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in rows:
+                running = False
+            scores = [row for row in rows if row is not None]
+
+            if scores:
+                error = "no database connection"
+                if conn:
+                    try:
+                        save_scores(cursor, conn, scores)
+                        self.committed.extend((row[1], row[2]) for row in scores)
+                        error = None
+                    except sqlite3.Error as e:
+                        error = e
+                # The database couldn't be opened or migrated, say which scores were lost instead of dropping them
+                if error is not None:
+                    for player_name, snake_speed, board_size, score, _ in scores:
+                        print(f"Could not save score {score} of {player_name} ({snake_speed}, {board_size}): {error}")
+
+            for _ in rows:
+                self.queue.task_done()
+
+        if conn:
+            conn.close()
@@ -0,0 +1,61 @@
+# Headless game session, free of pygame so it can run without a display or sound
+import random
+import secrets
+from src.apple import Apple
+from src.board import Board
+from src.rules import rules as default_rules
+from src.snake import Snake
+
+
+class Game:
+    def __init__(self, width, height, rules=default_rules, seed=None):
+        self.width = width
+        self.height = height
+        self.rules = rules
+
+        # The game's own random generator, seeded from entropy unless given a seed
+        # The seed is kept, so the seed and the inputs are enough to replay the game exactly
+        self.seed = secrets.randbits(63) if seed is None else seed
+        self.rng = random.Random(self.seed)
+
+        self.board = Board(width, height, self.rng)
+
+        # Create a snake at the center of the board
+        self.snake = Snake(width // 2, height // 2, self.board, rules)
+
+        # Create apples at random positions
+        self.apple = Apple(self.board, rules["apple_count"])
+
+        self.state = "game"
+        self.ticks = 0
+        self.inputs = []  # (tick, dx, dy) of every steer, the tick being the number of moves made before it
+
+    @property
+    def score(self):
+        return self.snake.score
+
+    def steer(self, dx, dy):
+        """Queue a direction change for the next tick"""
+        if self.state == "game":
+            self.inputs.append((self.ticks, dx, dy))
+            self.snake.steer(dx, dy)
+
+    def step(self, action=None):
+        """Advance the game by one tick
+        action is an optional (dx, dy) direction to steer towards before moving
+        Returns the game state: game, game_over or game_won"""
+        if self.state != "game":
+            return self.state
+
+        if action is not None:
+            self.steer(*action)
+
+        self.state = self.snake.update(self.apple)
+        self.ticks += 1
+        return self.state
+
+    def drain_events(self):
+        """Return and clear the sound events raised since the last call"""
+        events = self.snake.events
+        self.snake.events = []
+        return events
@@ -0,0 +1,100 @@
+# Statistics graphs, drawn with matplotlib or with pygame, from data read by the frontend
+# size is the (width, height) of the graph surface in pixels
+import pygame
+from src.assets import load_module
+from src.chart import bar_chart, line_chart, downsample
+from src.config import WHITE, BLACK, FOREST_GREEN, medium_font
+from src.text import render_text
+
+
+# Builds a graph with matplotlib as an RGBA buffer, safe to run off the main thread as it never touches pygame surfaces
+# data is the (labels, scores) of the graph, read on the main thread
+# Returns ("graph", buffer, size) or ("message", text), or None if it was cancelled
+def render_graph(graph_type, snake_speed, board_size, data, size, cancelled=lambda: False):
+    try:
+        labels, scores = data
+        width, height = size
+
+        if not scores:
+            # Display a message if no data
+            return "message", f"No Data Available for {snake_speed} Speed with {board_size} Size"
+
+        if cancelled():
+            return None
+
+        # matplotlib takes longer to import than the rest of the game, so it is only imported once a graph is shown
+        Figure = load_module("matplotlib.figure").Figure
+        FigureCanvas = load_module("matplotlib.backends.backend_agg").FigureCanvasAgg
+
+        # Create matplotlib figure without using plt.figure() as that scales the window down for some reason
+
+        fig = Figure(figsize=(width / 80, height / 80), dpi=80)
+        ax = fig.add_subplot(111)
+
+        if graph_type == "Score vs Player":
+            # Create a bar graph of scores by player
+            ax.bar(range(len(labels)), scores, color=pygame.Color(FOREST_GREEN).normalize())
+            ax.set_xticks(range(len(labels)))
+            ax.set_xticklabels(labels, rotation=45, ha='right')
+            ax.set_ylabel('Score')
+            ax.set_title(f'Top Scores for {snake_speed} Speed with {board_size} Board Size')
+        else:  # Score vs Attempt Num
+            # Create a line graph of scores over time, with no more points than there are pixels
+            ids, scores = downsample(labels, scores, int(width))
+            ax.plot(ids, scores, "o-", color=pygame.Color(FOREST_GREEN).normalize())
+            ax.set_ylabel('Score')
+            ax.set_title(f'Score History for {snake_speed} Speed with {board_size} Board Size')
+
+        fig.tight_layout()
+
+        # Rasterizing is the slowest part, skip it if the graph is no longer wanted
+        if cancelled():
+            return None
+
+        # Convert the Matplotlib figure to an RGBA buffer
+        canvas = FigureCanvas(fig)
+        canvas.draw()
+        return "graph", bytes(canvas.buffer_rgba()), (int(fig.bbox.width), int(fig.bbox.height))
+
+    except Exception as e:
+        print(f"Error generating graph: {e}")
+        return "message", "Error generating graph"
+
+
+def graph_to_surface(graph, size):
+    """Turn the result of render_graph into a fixed size surface, on the main thread"""
+    width, height = size
+    surf = pygame.Surface(size)
+    surf.fill(WHITE)
+
+    if graph[0] == "graph":
+        # Create pygame surface from the buffer and blit it to our fixed size surface
+        _, buf, buf_size = graph
+        surf.blit(pygame.image.frombuffer(buf, buf_size, "RGBA"), (0, 0))
+    else:
+        text = render_text(medium_font, graph[1], True, BLACK)
+        surf.blit(text, text.get_rect(center=(width // 2, height // 2)))
+    return surf
+
+
+def render_native_graph(graph_type, snake_speed, board_size, data, size):
+    """Draw a graph with pygame, quick enough to run on the main thread"""
+    try:
+        labels, scores = data
+        if not scores:
+            return graph_to_surface(("message", f"No Data Available for {snake_speed} Speed with {board_size} Size"),
+                                    size)
+
+        surf = pygame.Surface(size)
+        surf.fill(WHITE)
+        if graph_type == "Score vs Player":
+            bar_chart(surf, labels, scores, f'Top Scores for {snake_speed} Speed with {board_size} Board Size',
+                      'Score', FOREST_GREEN)
+        else:  # Score vs Attempt Num
+            line_chart(surf, labels, scores, f'Score History for {snake_speed} Speed with {board_size} Board Size',
+                       'Score', FOREST_GREEN)
+        return surf
+
+    except Exception as e:
+        print(f"Error generating graph: {e}")
+        return graph_to_surface(("message", "Error generating graph"), size)
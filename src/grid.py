@@ -0,0 +1,87 @@
+# Compact occupancy grid used by the board, snake and apple
+from array import array
+
+# Cell states
+EMPTY = 0
+SNAKE = 1
+APPLE = 2
+
+
+class Grid:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+
+        # One byte per cell, stored row by row
+        self.cells = bytearray(width * height)
+
+        # Index of the free cells so that a random empty cell can be picked in O(1)
+        # free_cells is a dense list of flat cell indices and free_pos maps a cell to its slot in it (-1 if not free)
+        self.free_cells = array("i", range(width * height))
+        self.free_pos = array("i", range(width * height))
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def get(self, x, y):
+        return self.cells[y * self.width + x]
+
+    def set(self, x, y, state):
+        i = y * self.width + x
+        old_state = self.cells[i]
+        if old_state == state:
+            return
+        self.cells[i] = state
+
+        # Keep the free cell index in sync
+        if old_state == EMPTY:
+            self._remove_free(i)
+        elif state == EMPTY:
+            self._add_free(i)
+
+    def clear(self, x, y):
+        self.set(x, y, EMPTY)
+
+    def count(self, state):
+        """Number of cells in the given state"""
+        if state == EMPTY:
+            return len(self.free_cells)
+        return self.cells.count(state)
+
+    def row(self, y):
+        """Read-only view of one row of the grid"""
+        start = y * self.width
+        return memoryview(self.cells)[start:start + self.width].toreadonly()
+
+    def random_free(self, rng):
+        """Return a uniformly random empty cell as (x, y), or None if the grid is full
+        rng is the random generator of the game session, so games never share one"""
+        if not self.free_cells:
+            return None
+        i = self.free_cells[rng.randrange(len(self.free_cells))]
+        return i % self.width, i // self.width
+
+    def random_free_many(self, count, rng):
+        """Return up to count distinct uniformly random empty cells as (x, y), fewer if there aren't enough
+        Draws them all at once instead of one random_free call per cell, for simulators that spawn a lot"""
+        if count == 1:
+            # Same draw as random_free, so games seeded the same way place their apples the same way
+            position = self.random_free(rng)
+            return [] if position is None else [position]
+
+        picks = rng.sample(range(len(self.free_cells)), min(count, len(self.free_cells)))
+        width = self.width
+        return [(self.free_cells[pick] % width, self.free_cells[pick] // width) for pick in picks]
+
+    def _add_free(self, i):
+        self.free_pos[i] = len(self.free_cells)
+        self.free_cells.append(i)
+
+    def _remove_free(self, i):
+        # Swap the last free cell into the removed slot so that removal is O(1)
+        pos = self.free_pos[i]
+        last = self.free_cells.pop()
+        if last != i:
+            self.free_cells[pos] = last
+            self.free_pos[last] = pos
+        self.free_pos[i] = -1
@@ -1,4 +1,5 @@
 from src.config import *
+from src.text import render_text
 
 
 # Button class for easier button management
@@ -11,24 +12,42 @@ class Button:
         self.text_color = text_color
         self.font = font
         self.is_hovered = False
+        self.visible = True
+        self.dirty = True  # Needs to be redrawn
+
+    @property
+    def bounds(self):
+        """Area covered when drawn"""
+        return self.rect
+
+    def set_visible(self, visible):
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = True
 
     def draw(self, surface):
+        if not self.visible:
+            return
+
         # Draw the button rect
         color = self.hover_color if self.is_hovered else self.color
         pygame.draw.rect(surface, color, self.rect)
         pygame.draw.rect(surface, BLACK, self.rect, 2)  # Black border
 
         # Draw the text
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = render_text(self.font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(center=self.rect.center)
         surface.blit(text_surf, text_rect)
 
     def check_hover(self, pos):
-        self.is_hovered = self.rect.collidepoint(pos)
+        is_hovered = self.rect.collidepoint(pos)
+        if is_hovered != self.is_hovered:
+            self.is_hovered = is_hovered
+            self.dirty = True
         return self.is_hovered
 
     def is_clicked(self, pos, event):
-        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        if self.visible and event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             return self.rect.collidepoint(pos)
         return False
 
@@ -44,6 +63,7 @@ class Dropdown:
         self.text_color = text_color
         self.is_open = False
         self.is_hovered = False
+        self.dirty = True  # Needs to be redrawn
         self.option_rects = []
 
         # Create option rects
@@ -51,6 +71,13 @@ class Dropdown:
             option_rect = pygame.Rect(x, y + (i + 1) * height, width, height)
             self.option_rects.append(option_rect)
 
+    @property
+    def bounds(self):
+        """Area covered when drawn, including the options when open"""
+        if self.is_open:
+            return self.rect.unionall(self.option_rects)
+        return self.rect
+
     def draw(self, surface):
         # Draw the dropdown button
         color = self.hover_color if self.is_hovered else self.color
@@ -60,7 +87,7 @@ class Dropdown:
         # Draw the selected option text
         rect = self.rect.copy()
         rect.width -= 22
-        text_surf = small_font.render(self.selected_option, True, self.text_color)
+        text_surf = render_text(small_font, self.selected_option, True, self.text_color)
         text_rect = text_surf.get_rect(center=rect.center)
         surface.blit(text_surf, text_rect)
 
@@ -76,18 +103,22 @@ class Dropdown:
                 pygame.draw.rect(surface, LIGHT_GREEN, option_rect)
                 pygame.draw.rect(surface, BLACK, option_rect, 2)
 
-                option_text = small_font.render(self.options[i], True, BLACK)
+                option_text = render_text(small_font, self.options[i], True, BLACK)
                 option_text_rect = option_text.get_rect(center=option_rect.center)
                 surface.blit(option_text, option_text_rect)
 
     def check_hover(self, pos):
-        self.is_hovered = self.rect.collidepoint(pos)
+        is_hovered = self.rect.collidepoint(pos)
+        if is_hovered != self.is_hovered:
+            self.is_hovered = is_hovered
+            self.dirty = True
         return self.is_hovered
 
     def handle_event(self, pos, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             if self.rect.collidepoint(pos):
                 self.is_open = not self.is_open
+                self.dirty = True
                 return True
 
             if self.is_open:
@@ -95,30 +126,65 @@ class Dropdown:
                     if option_rect.collidepoint(pos):
                         self.selected_option = self.options[i]
                         self.is_open = False
+                        self.dirty = True
                         return True
         return False
 
 
 # ScrollableText class for the how to play screen
+# The text is wrapped once and each line is rendered once, drawing only blits the lines in view
 class ScrollableText:
     def __init__(self, x, y, width, height, text, line_spacing=40):
         self.rect = pygame.Rect(x, y, width, height)
-        self.text = text
+        self.text = None
         self.line_spacing = line_spacing
         self.scroll_y = 0
         self.scroll_speed = 15
         self.max_scroll = 0
-        self.lines = self._wrap_text(text, width)
         self.padding = 10
-
+        self.lines = []
+        self.line_surfaces = []  # Rendered lines, None until a line first comes into view
+        self.dirty = True  # Needs to be redrawn
+        self.set_text(text)
+
+    @property
+    def bounds(self):
+        """Area covered when drawn"""
+        return self.rect
+
+    def set_text(self, text):
+        """Change the text, it is only wrapped again if it actually changed"""
+        if text == self.text:
+            return
+        self.text = text
+        self._layout()
+
+    def set_size(self, width, height):
+        """Resize the box, the text is only wrapped again if the width changed"""
+        rewrap = width != self.rect.width
+        self.rect.size = (width, height)
+        if rewrap:
+            self._layout()
+        else:
+            self._update_max_scroll()
+
+    def _layout(self):
+        self.lines = self._wrap_text(self.text, self.rect.width)
+        self.line_surfaces = [None] * len(self.lines)
+        self._update_max_scroll()
+        self.dirty = True
+
+    def _update_max_scroll(self):
         # Calculate max scroll based on content height
         total_height = len(self.lines) * self.line_spacing + self.padding
-        self.max_scroll = max(0, total_height - height)
+        self.max_scroll = max(0, total_height - self.rect.height)
+        self.scroll_y = min(self.scroll_y, self.max_scroll)
 
     def _wrap_text(self, text, width):
         # Split text into paragraphs based on double newlines
         paragraphs = text.split('\n\n')
         all_lines = []
+        max_width = width - 20
 
         for paragraph in paragraphs:
             # If paragraph is just a newline, add an empty line
@@ -130,23 +196,25 @@ class ScrollableText:
             paragraph_lines = paragraph.split('\n')
             for line in paragraph_lines:
                 # If the line is short enough, add it directly
-                if medium_font.size(line)[0] < width - 20:
+                if medium_font.size(line)[0] < max_width:
                     all_lines.append(line)
                     continue
 
-                # Otherwise, wrap the line word by word
+                # Otherwise, wrap the line word by word, measuring each word only once
                 words = line.split()
                 current_line = ""
+                current_width = 0
 
                 for word in words:
-                    test_line = current_line + word + " "
-                    text_width = medium_font.size(test_line)[0]
+                    word_width = medium_font.size(word + " ")[0]
 
-                    if text_width < width - 20:
-                        current_line = test_line
+                    if current_width + word_width < max_width:
+                        current_line += word + " "
+                        current_width += word_width
                     else:
                         all_lines.append(current_line)
                         current_line = word + " "
+                        current_width = word_width
 
                 if current_line:
                     all_lines.append(current_line)
@@ -159,17 +227,20 @@ class ScrollableText:
         pygame.draw.rect(surface, BLACK, self.rect, 2)
 
         # Create a clipping rectangle to prevent text from rendering outside the box
-        surface.set_clip(self.rect)
-
-        # Draw the text
-        y_pos = self.rect.top - self.scroll_y
-        for line in self.lines:
-            text_surf = medium_font.render(line, True, BLACK)
-            surface.blit(text_surf, (self.rect.left + 10, y_pos))
-            y_pos += self.line_spacing
+        previous_clip = surface.get_clip()
+        surface.set_clip(self.rect.clip(previous_clip))
+
+        # Draw only the lines that are in view, one line early in case it is taller than the line spacing
+        first = max(0, self.scroll_y // self.line_spacing - 1)
+        last = min(len(self.lines), (self.scroll_y + self.rect.height) // self.line_spacing + 1)
+        for i in range(first, last):
+            text_surf = self.line_surfaces[i]
+            if text_surf is None:
+                text_surf = self.line_surfaces[i] = medium_font.render(self.lines[i], True, BLACK)
+            surface.blit(text_surf, (self.rect.left + 10, self.rect.top - self.scroll_y + i * self.line_spacing))
 
         # Reset clipping rectangle
-        surface.set_clip(None)
+        surface.set_clip(previous_clip)
 
         # Draw scrollbar if needed
         if self.max_scroll > 0:
@@ -184,20 +255,25 @@ class ScrollableText:
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 4:  # Scroll up
-                self.scroll_y = max(0, self.scroll_y - self.scroll_speed)
+                self._scroll_to(max(0, self.scroll_y - self.scroll_speed))
                 return True
             elif event.button == 5:  # Scroll down
-                self.scroll_y = min(self.max_scroll, self.scroll_y + self.scroll_speed)
+                self._scroll_to(min(self.max_scroll, self.scroll_y + self.scroll_speed))
                 return True
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_UP:  # Scroll up
-                self.scroll_y = max(0, self.scroll_y - self.scroll_speed)
+                self._scroll_to(max(0, self.scroll_y - self.scroll_speed))
                 return True
             elif event.key == pygame.K_DOWN:  # Scroll down
-                self.scroll_y = min(self.max_scroll, self.scroll_y + self.scroll_speed)
+                self._scroll_to(min(self.max_scroll, self.scroll_y + self.scroll_speed))
                 return True
         return False
 
+    def _scroll_to(self, scroll_y):
+        if scroll_y != self.scroll_y:
+            self.scroll_y = scroll_y
+            self.dirty = True
+
 
 class TextInput:
     def __init__(self, x, y, width, height, font=medium_font, max_length=15):
@@ -215,6 +291,15 @@ class TextInput:
         self.cursor_timer = 0
         self.cursor_blink_speed = 500  # milliseconds
         self.max_length = max_length
+        self.dirty = True  # Needs to be redrawn
+        self.text_rect = None  # Where the text was last drawn, long names can stick out of the box
+
+    @property
+    def bounds(self):
+        """Area covered when drawn"""
+        if self.text_rect:
+            return self.rect.union(self.text_rect)
+        return self.rect
 
     def draw(self, surface):
         # Draw the input box
@@ -223,10 +308,11 @@ class TextInput:
         pygame.draw.rect(surface, border_color, self.rect, 2)
 
         # Draw the text
-        text_surf = self.font.render(self.text, True, self.text_color)
+        text_surf = render_text(self.font, self.text, True, self.text_color)
         text_rect = text_surf.get_rect(topleft=(self.rect.x + 5,
                                                 self.rect.y + (self.rect.height - text_surf.get_height()) // 2))
         surface.blit(text_surf, text_rect)
+        self.text_rect = text_rect.inflate(4, 0)  # Room for the cursor
 
         # Draw the cursor
         if self.active and self.cursor_visible:
@@ -239,20 +325,26 @@ class TextInput:
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN:
             # Toggle active state
-            self.active = self.rect.collidepoint(event.pos)
+            active = self.rect.collidepoint(event.pos)
+            if active != self.active:
+                self.active = active
+                self.dirty = True
             return self.active
 
         if event.type == pygame.KEYDOWN and self.active:
             if event.key == pygame.K_BACKSPACE:
                 self.text = self.text[:-1]
+                self.dirty = True
                 return True
             elif event.key == pygame.K_RETURN:
                 self.active = False
+                self.dirty = True
                 return True
             elif len(self.text) < self.max_length:
                 # Only add printable characters
                 if event.unicode.isprintable():
                     self.text += event.unicode
+                    self.dirty = True
                     return True
         return False
 
@@ -263,3 +355,30 @@ class TextInput:
             if self.cursor_timer >= self.cursor_blink_speed:
                 self.cursor_visible = not self.cursor_visible
                 self.cursor_timer = 0
+                self.dirty = True
+
+
+# Area of a screen that shows a pre-rendered surface, like the statistics graph
+class SurfaceView:
+    def __init__(self, x, y, width, height, background=WHITE):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.background = background
+        self.surface = None
+        self.dirty = True  # Needs to be redrawn
+
+    @property
+    def bounds(self):
+        """Area covered when drawn"""
+        return self.rect
+
+    def set_surface(self, surface):
+        if surface is not self.surface:
+            self.surface = surface
+            self.dirty = True
+
+    def draw(self, surface):
+        # Create a background for the view area
+        surface.fill(self.background, self.rect)
+        if self.surface:
+            # Center the surface on the background
+            surface.blit(self.surface, self.surface.get_rect(center=self.rect.center))
@@ -0,0 +1,146 @@
+# Pygame renderers for the headless game objects
+import pygame
+from src.config import *
+from src.grid import SNAKE, APPLE
+from src.sprites import get_sprites
+
+
+def square_rect(x, y, grid_size):
+    """Area of board square (x, y) including its grid lines"""
+    return pygame.Rect(x * grid_size, y * grid_size, grid_size+1, grid_size+1)
+
+
+class BoardRenderer:
+    def __init__(self, board, grid_size, start_x=0, start_y=0):
+        self.board = board
+        self.grid_size = grid_size
+        self.start_x = start_x
+        self.start_y = start_y
+        self.sprites = get_sprites(grid_size)
+
+    def render(self, surface, init=False):
+        """Draw the game board on the surface
+        Returns the list of rects that were drawn to"""
+        board = self.board
+
+        if init:
+            # Draw background
+            surface.fill(board_bg_color)
+
+            # Draw grid lines
+            for x in range(0, (board.width+1) * self.grid_size, self.grid_size):
+                pygame.draw.line(surface, board_grid_color, (x, 0), (x, board.height * self.grid_size))
+
+            for y in range(0, (board.height+1) * self.grid_size, self.grid_size):
+                pygame.draw.line(surface, board_grid_color, (0, y), (board.width * self.grid_size, y))
+            rects = [surface.get_rect()]
+
+        else:
+            tile = self.sprites.tile
+            rects = surface.blits([(tile, (x * self.grid_size, y * self.grid_size))
+                                   for x, y in board.squares_to_update])
+            board.squares_to_update = set()
+
+        # The border only overlaps the edge squares, so it never adds to the drawn area
+        self.render_border(surface)
+        return rects
+
+    def render_border(self, surface):
+
+        # Draw border
+        border_rect = pygame.Rect(0, 0, self.board.width * self.grid_size + 4,
+                                  self.board.height * self.grid_size + 4)
+        pygame.draw.rect(surface, board_border_color, border_rect, 3)  # 3px border width
+
+
+class SnakeRenderer:
+    def __init__(self, snake, grid_size, apple=None):
+        self.snake = snake
+        self.apple = apple
+        self.grid_size = grid_size
+        self.sprites = get_sprites(grid_size)
+
+        # Where the head was on the last two ticks, used to slide the head between squares
+        self.head = snake.segments[0]
+        self.previous_head = self.head
+        self.sliding = False  # The head was last drawn between two squares
+
+    def render(self, surface, alpha=1.0):
+        """Draw the snake on the surface
+        alpha is how far the frame is between the last tick and the next one, the head is drawn that far
+        between its previous square and its current one
+        Returns the list of rects that were drawn to"""
+        snake = self.snake
+        head = snake.segments[0]
+        rects = []
+
+        if head != self.head:
+            if self.sliding and self.previous_head != head:
+                # Clean up after the head that was sliding out of this square
+                rects.append(self.restore_square(surface, *self.previous_head))
+            self.previous_head = snake.segments[1] if len(snake.segments) > 1 else self.head
+            self.head = head
+
+        # Squares can be vacated again when several ticks ran since the last render
+        grid = snake.board.grid
+        body = self.sprites.body
+        rects += surface.blits([(body, (x * self.grid_size, y * self.grid_size))
+                                for x, y in snake.segments_to_update
+                                if (x, y) != head and grid.get(x, y) == SNAKE])
+
+        dx = head[0] - self.previous_head[0]
+        dy = head[1] - self.previous_head[1]
+        if alpha >= 1 or abs(dx) + abs(dy) != 1:
+            # No interpolation, or the snake teleported through a wall
+            if self.sliding:
+                rects.append(self.restore_square(surface, *self.previous_head))
+            if head in snake.segments_to_update or self.sliding:
+                rects.append(self.render_head(surface, head[0] * self.grid_size, head[1] * self.grid_size,
+                                              snake.direction))
+            self.sliding = False
+        else:
+            # Redraw both squares the head is sliding between, then the head on top
+            prev_x, prev_y = self.previous_head
+            rect = self.restore_square(surface, prev_x, prev_y)
+            rect.union_ip(surface.blit(self.sprites.tile, (head[0] * self.grid_size, head[1] * self.grid_size)))
+            self.render_head(surface, (prev_x + dx * alpha) * self.grid_size, (prev_y + dy * alpha) * self.grid_size,
+                             (dx, dy))
+            rects.append(rect)
+            self.sliding = True
+
+        snake.segments_to_update = set()
+        return rects
+
+    def restore_square(self, surface, x, y):
+        """Redraw square (x, y) without the head on it"""
+        position = (x * self.grid_size, y * self.grid_size)
+        state = self.snake.board.grid.get(x, y)
+        if state == SNAKE and (x, y) != self.snake.segments[0]:
+            return surface.blit(self.sprites.body, position)
+
+        rect = surface.blit(self.sprites.tile, position)
+        if state == APPLE and self.apple:
+            # Apples are drawn after the snake, have it draw this one again
+            self.apple.positions_to_render.add((x, y))
+        return rect
+
+    def render_head(self, surface, x, y, direction):
+        """Draw the head with its top left corner at pixel (x, y), looking in direction"""
+        return surface.blit(self.sprites.heads[direction], (x, y))
+
+
+class AppleRenderer:
+    def __init__(self, apple, grid_size):
+        self.apple = apple
+        self.grid_size = grid_size
+        self.sprites = get_sprites(grid_size)
+
+    def render(self, surface):
+        """Draw the apples on the surface
+        Returns the list of rects that were drawn to"""
+        # Skip apples that were eaten again before they got drawn
+        apple = self.sprites.apple
+        rects = surface.blits([(apple, (x * self.grid_size, y * self.grid_size))
+                               for x, y in self.apple.positions_to_render if (x, y) in self.apple.positions])
+        self.apple.positions_to_render = set()
+        return rects
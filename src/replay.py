@@ -0,0 +1,86 @@
+# Recordings of games, the seed and inputs of a game are enough to play it again exactly
+import struct
+from src.game import Game
+
+# Directions, indexed by the code stored for them
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Header: magic, format version, seed, board width and height, wall rule, apple count
+HEADER = struct.Struct("<4sBQHHcB")
+MAGIC = b"SNKR"
+# 2: more than one apple is placed with a single draw, version 1 replays of those games place them differently
+# One apple is still placed the same way, so version 1 replays of one apple games play as before
+VERSION = 2
+
+# One input: the tick it was made before and its direction code, 5 bytes each
+INPUT = struct.Struct("<IB")
+
+
+class Replay:
+    def __init__(self, seed, width, height, rules, inputs=()):
+        self.seed = seed
+        self.width = width
+        self.height = height
+        self.rules = rules
+        self.inputs = list(inputs)  # (tick, dx, dy)
+
+    @classmethod
+    def from_game(cls, game):
+        return cls(game.seed, game.width, game.height, game.rules, game.inputs)
+
+    def to_bytes(self):
+        header = HEADER.pack(MAGIC, VERSION, self.seed, self.width, self.height,
+                             self.rules["on_wall_collision"].encode(), self.rules["apple_count"])
+        return header + b"".join(INPUT.pack(tick, DIRECTION_CODES[(dx, dy)]) for tick, dx, dy in self.inputs)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Raises ValueError for anything that isn't a whole replay this version of the game can play"""
+        if len(data) < HEADER.size:
+            raise ValueError("Not a replay, too short for the header")
+        magic, version, seed, width, height, wall, apple_count = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a replay")
+        if version != VERSION and not (version == 1 and apple_count == 1):
+            raise ValueError(f"Replay format version {version}, this version of the game only plays {VERSION}")
+
+        # Damaged or edited replays could otherwise crash the game instead of failing here
+        if (len(data) - HEADER.size) % INPUT.size:
+            raise ValueError("Damaged replay, the last input is cut off")
+        if wall not in (b"E", b"T") or not width or not height:
+            raise ValueError("Damaged replay, the board or rules are invalid")
+
+        inputs = []
+        for tick, code in INPUT.iter_unpack(data[HEADER.size:]):
+            if code >= len(DIRECTIONS):
+                raise ValueError(f"Damaged replay, unknown direction code {code}")
+            inputs.append((tick, *DIRECTIONS[code]))
+
+        rules = {"on_wall_collision": wall.decode(), "apple_count": apple_count}
+        return cls(seed, width, height, rules, inputs)
+
+    def new_game(self):
+        """A fresh game set up the same way as the recorded one"""
+        return Game(self.width, self.height, self.rules, self.seed)
+
+    def steer(self, game, position):
+        """Apply the inputs due before the game's next tick, starting at inputs[position]
+        Returns the position of the next input still to come"""
+        while position < len(self.inputs) and self.inputs[position][0] == game.ticks:
+            _, dx, dy = self.inputs[position]
+            game.steer(dx, dy)
+            position += 1
+        return position
+
+
+def play(replay, max_ticks=None):
+    """Play a replay through as fast as possible, without rendering, and return the finished game
+    max_ticks stops a game that never ends, which a damaged or edited replay could do"""
+    game = replay.new_game()
+    position = 0
+    while game.state == "game" and (max_ticks is None or game.ticks < max_ticks):
+        position = replay.steer(game, position)
+        game.step()
+        game.drain_events()
+    return game
@@ -0,0 +1,31 @@
+# Game modes and rules
+# Kept free of pygame so that the game logic can run headless
+
+speeds = ["Slow", "Medium", "Fast"]
+speeds_val = {
+    "Slow": 4,
+    "Medium": 6,
+    "Fast": 10
+}
+board_sizes = ["Small", "Medium", "Large"]
+board_sizes_val = {
+    "Small": 10,
+    "Medium": 15,
+    "Large": 20
+}
+
+# Rules
+rules = {
+    # Can take values E for End, T for Teleport (to the other end of the board),
+    "on_wall_collision": "T",
+    # Number of apples on the board at the same time
+    "apple_count": 1
+}
+
+
+def board_dimensions(board_size, screen_width=800, screen_height=600):
+    """Grid size in pixels and the number of columns and rows for a board size
+    The board takes the bottom 4/5 of the screen"""
+    square_num = board_sizes_val[board_size]
+    grid_size = max(screen_width // square_num, screen_height * (4 / 5) // square_num)
+    return grid_size, int(screen_width // grid_size), int(screen_height * (4 / 5) // grid_size)
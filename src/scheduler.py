@@ -0,0 +1,35 @@
+# Fixed timestep scheduler, runs the game logic at a steady rate whatever the frame rate is
+
+
+class FixedTimestep:
+    def __init__(self, tick_rate, max_catch_up=5):
+        self.tick_time = 1000 / tick_rate  # Milliseconds per logic tick
+        self.max_catch_up = max_catch_up  # Most ticks run in one frame after a stall
+        self.accumulator = 0.0
+        self.dropped_time = 0.0  # Time thrown away because of the catch up cap
+
+    def advance(self, delta_time):
+        """Add the milliseconds since the last frame
+        Returns the number of logic ticks to run this frame"""
+        self.accumulator += delta_time
+        ticks = int(self.accumulator // self.tick_time)
+
+        if ticks > self.max_catch_up:
+            # Too far behind, run the capped number of ticks and drop the rest of the backlog
+            ticks = self.max_catch_up
+            backlog = self.accumulator - ticks * self.tick_time
+            self.accumulator = backlog % self.tick_time
+            self.dropped_time += backlog - self.accumulator
+        else:
+            self.accumulator -= ticks * self.tick_time
+
+        return ticks
+
+    @property
+    def alpha(self):
+        """How far the current frame is between the last tick and the next one, from 0 to 1"""
+        return self.accumulator / self.tick_time
+
+    def reset(self):
+        self.accumulator = 0.0
+        self.dropped_time = 0.0
@@ -0,0 +1,58 @@
+# Menu screens with a cached static layer, only the widgets that changed get redrawn
+import pygame
+
+
+class CachedScreen:
+    def __init__(self, draw_background, widgets):
+        self.draw_background = draw_background  # Draws the parts of the screen that never change
+        self.widgets = widgets  # Anything with draw(surface), bounds and dirty, drawn in this order
+        self.background = None
+        self.drawn_bounds = {}  # Area each widget covered when it was last drawn
+        self.full_redraw = True
+
+    def invalidate(self, background=False):
+        """Redraw the whole screen next time, and the static layer too if background is True"""
+        self.full_redraw = True
+        if background:
+            self.background = None
+
+    def draw(self, surface):
+        """Redraw whatever changed since the last call
+        Returns the list of rects that were drawn to, empty when nothing changed"""
+        if self.background is None:
+            self.background = pygame.Surface(surface.get_size())
+            self.draw_background(self.background)
+            self.full_redraw = True
+
+        if self.full_redraw:
+            surface.blit(self.background, (0, 0))
+            for widget in self.widgets:
+                self._draw_widget(surface, widget)
+            self.full_redraw = False
+            return [surface.get_rect()]
+
+        # Areas to repaint, covering both where the changed widgets were and where they are now
+        rects = []
+        for widget in self.widgets:
+            if widget.dirty:
+                rect = widget.bounds
+                if widget in self.drawn_bounds:
+                    rect = rect.union(self.drawn_bounds[widget])
+                rects.append(rect)
+        if not rects:
+            return rects
+
+        # Repaint each area from the static layer, then every widget overlapping it
+        for rect in rects:
+            surface.set_clip(rect)
+            surface.blit(self.background, rect, rect)
+            for widget in self.widgets:
+                if widget.bounds.colliderect(rect) or self.drawn_bounds.get(widget, rect).colliderect(rect):
+                    self._draw_widget(surface, widget)
+        surface.set_clip(None)
+        return rects
+
+    def _draw_widget(self, surface, widget):
+        widget.draw(surface)
+        widget.dirty = False
+        self.drawn_bounds[widget] = widget.bounds.copy()
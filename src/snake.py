@@ -1,30 +1,30 @@
-from src.config import *
+from collections import deque
+from src.grid import SNAKE
+from src.rules import rules as default_rules
 
 
 class Snake:
-    def __init__(self, x, y, grid_size, board, speed):
+    def __init__(self, x, y, board, rules=default_rules):
         # Initialize snake segments (head is at index 0)
-        self.segments = [(x, y)]
-        self.grid_size = grid_size
+        # The board grid doubles as the occupancy map used for collision checks
+        self.segments = deque([(x, y)])
         self.board = board
 
         self.direction = (1, 0)  # Start moving right
         self.changed_direction_this_frame = False
         self.direction_change_pending = []
 
-        self.head_color = LIGHT_GREEN
-        self.color = LIME_GREEN
         self.growth_pending = 0  # Number of segments to grow
 
         # Set initial position in board
-        self.board.grid.iloc[y, x] = 1  # 1 represents snake
+        self.board.grid.set(x, y, SNAKE)
 
         # This is used to optimise rendering
-        # Only those squares are re-rendered which have been updated this frame
+        # Only those squares are re-rendered which have been updated since the last render
         self.segments_to_update = {(x, y)}
 
-        self.SPEED = speed
-        self.snake_update_timer = 60 // self.SPEED  # Updates once every 6 frames
+        # Sound events raised by the game logic, played by the frontend
+        self.events = []
 
         self.rules = rules
 
@@ -43,7 +43,7 @@ class Snake:
             self.changed_direction_this_frame = True
 
             # Play turn sound
-            turn.play()
+            self.events.append("turn")
         elif len(self.direction_change_pending) < 3:
             self.direction_change_pending.append((dx, dy))
 
@@ -52,34 +52,18 @@ class Snake:
         self.growth_pending += 1
 
     def check_collision_with_apple(self, apple, head_x, head_y):
-        """Check if snake's head collides with the apple"""
-        apple_x, apple_y = apple.position
-
-        return head_x == apple_x and head_y == apple_y
-
-    def handle_event(self, event):
-        # Handle direction change events
-        if event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP and self.direction != (0, 1):
-                self.change_direction(0, -1)
-            elif event.key == pygame.K_DOWN and self.direction != (0, -1):
-                self.change_direction(0, 1)
-            elif event.key == pygame.K_LEFT and self.direction != (1, 0):
-                self.change_direction(-1, 0)
-            elif event.key == pygame.K_RIGHT and self.direction != (-1, 0):
-                self.change_direction(1, 0)
+        """Check if snake's head collides with an apple"""
+        return (head_x, head_y) in apple.positions
 
-    def update(self, apple):
-        """Move the snake based on its current direction
-        Returns True if game over, False otherwise"""
-
-        if self.snake_update_timer:
-            self.snake_update_timer -= 1
-            return "game"
+    def steer(self, dx, dy):
+        """Change direction unless that would turn the snake back onto itself"""
+        if self.direction != (-dx, -dy):
+            self.change_direction(dx, dy)
 
-        self.snake_update_timer = 60 // self.SPEED
+    def update(self, apple):
+        """Move the snake one square based on its current direction
+        Returns the new game state: game, game_over or game_won"""
 
-        self.segments_to_update = set()
         respawn = False
         # Get current head position
         head_x, head_y = self.segments[0]
@@ -97,7 +81,7 @@ class Snake:
                 new_head_y < 0 or new_head_y >= self.board.height):
             if self.rules["on_wall_collision"] == "E":
                 # Play collision sound
-                collision.play()
+                self.events.append("collision")
                 return "game_over"  # Game over
 
             elif self.rules["on_wall_collision"] == "T":
@@ -118,9 +102,10 @@ class Snake:
             self.score_updated_this_frame = True
             self.grow()
             respawn = True
+            eaten = (new_head_x, new_head_y)
 
             # Play apple eaten sound
-            apple_eaten.play()
+            self.events.append("apple_eaten")
 
         # Remove tail if not growing
         if self.growth_pending > 0:
@@ -129,21 +114,22 @@ class Snake:
         else:
             tail_x, tail_y = self.segments.pop()
             # Clear tail position in board
-            self.board.grid.iloc[tail_y, tail_x] = 0
+            self.board.grid.clear(tail_x, tail_y)
             self.board.squares_to_update.add((tail_x, tail_y))
 
         # Check if snake hits itself
-        if (new_head_x, new_head_y) in self.segments:
+        # The tail has already been cleared from the grid, so the head may move into the cell it just left
+        if self.board.grid.get(new_head_x, new_head_y) == SNAKE:
             # Play collision sound
-            collision.play()
+            self.events.append("collision")
             return "game_over"  # Game over
 
         # Add new head to segments
-        self.segments.insert(0, (new_head_x, new_head_y))
+        self.segments.appendleft((new_head_x, new_head_y))
         self.segments_to_update.add((new_head_x, new_head_y))
 
         # Update board with new head position
-        self.board.grid.iloc[new_head_y, new_head_x] = 1
+        self.board.grid.set(new_head_x, new_head_y, SNAKE)
 
         # Check if the snake has filled up the board
         if len(self.segments) >= self.board.width * self.board.height:
@@ -155,69 +141,8 @@ class Snake:
 
         # If apple was eaten, spawn new apple
         if respawn:
-            apple.spawn()
+            apple.spawn(eaten)
 
         if self.time_bonus >= 0:
             self.time_bonus -= 0.06
         return "game"  # Game continues
-
-    def render(self, surface):
-        """Draw the snake on the surface"""
-        for segment in self.segments_to_update:
-            x, y = segment
-            # Draw the segment
-            rect = pygame.Rect(
-                x * self.grid_size,
-                y * self.grid_size,
-                self.grid_size,
-                self.grid_size
-            )
-
-            # Make the head a slightly different color
-            # We use segments for indexing and not segments_to_update as lists are ordered
-            # but sets are unordered
-            if segment == self.segments[0]:
-                pygame.draw.rect(surface, self.head_color, rect)  # Darker green for head
-                # Draw eyes
-                eye_size = self.grid_size // 5
-                dx, dy = self.direction
-
-                # Position the eyes based on current direction
-                if dx == 1:  # Right
-                    left_eye = (x * self.grid_size + 3 * self.grid_size // 4,
-                                y * self.grid_size + self.grid_size // 4)
-                    right_eye = (x * self.grid_size + 3 * self.grid_size // 4,
-                                 y * self.grid_size + 3 * self.grid_size // 4)
-                elif dx == -1:  # Left
-                    left_eye = (x * self.grid_size + self.grid_size // 4,
-                                y * self.grid_size + self.grid_size // 4)
-                    right_eye = (x * self.grid_size + self.grid_size // 4,
-                                 y * self.grid_size + 3 * self.grid_size // 4)
-                elif dy == 1:  # Down
-                    left_eye = (x * self.grid_size + self.grid_size // 4,
-                                y * self.grid_size + 3 * self.grid_size // 4)
-                    right_eye = (x * self.grid_size + 3 * self.grid_size // 4,
-                                 y * self.grid_size + 3 * self.grid_size // 4)
-                else:  # Up
-                    left_eye = (x * self.grid_size + self.grid_size // 4,
-                                y * self.grid_size + self.grid_size // 4)
-                    right_eye = (x * self.grid_size + 3 * self.grid_size // 4,
-                                 y * self.grid_size + self.grid_size // 4)
-
-                pygame.draw.circle(surface, WHITE, left_eye, eye_size)  # White eye
-                pygame.draw.circle(surface, WHITE, right_eye, eye_size)  # White eye
-                pygame.draw.circle(surface, BLACK, left_eye, eye_size // 2)  # Black pupil
-                pygame.draw.circle(surface, BLACK, right_eye, eye_size // 2)  # Black pupil
-
-            else:
-                # Regular body segment
-                pygame.draw.rect(surface, self.color, rect)
-
-                # Draw a smaller rectangle inside for a better look
-                inner_rect = pygame.Rect(
-                    x * self.grid_size + 2,
-                    y * self.grid_size + 2,
-                    self.grid_size - 4,
-                    self.grid_size - 4
-                )
-                pygame.draw.rect(surface, (0, 220, 0), inner_rect)  # Lighter green for inner part
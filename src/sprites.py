@@ -0,0 +1,104 @@
+# Pre-rendered sprites for the board, snake and apple, so that drawing a square is a single blit
+import pygame
+from src.config import *
+
+# Sprite sets by grid size
+_sprites = {}
+
+
+def get_sprites(grid_size):
+    """Sprites for a grid size, rendered the first time they are asked for
+    Sprites made before there is a display can't be converted to its pixel format, so they aren't cached"""
+    sprites = _sprites.get(grid_size)
+    if sprites is None:
+        sprites = Sprites(grid_size)
+        if sprites.converted:
+            _sprites[grid_size] = sprites
+    return sprites
+
+
+class Sprites:
+    def __init__(self, grid_size):
+        self.grid_size = grid_size
+        self.converted = pygame.display.get_surface() is not None  # In the display's pixel format
+
+        # Empty board square, one pixel bigger than the grid size so it includes the grid lines on both sides
+        self.tile = self._finish(self._render_tile())
+        self.body = self._finish(self._render_body())
+        self.apple = self._finish(self._render_apple())  # Apple on an empty square
+
+        # Heads by the direction they are looking in
+        self.heads = {direction: self._finish(self._render_head(direction))
+                      for direction in ((1, 0), (-1, 0), (0, 1), (0, -1))}
+
+    def _finish(self, surface):
+        # Match the display pixel format so blits don't need converting, only possible once there is a display
+        if self.converted:
+            return surface.convert()
+        return surface
+
+    def _render_tile(self):
+        size = self.grid_size + 1
+        surface = pygame.Surface((size, size))
+        surface.fill(board_bg_color)
+        pygame.draw.rect(surface, board_grid_color, surface.get_rect(), 1)
+        return surface
+
+    def _render_body(self):
+        surface = pygame.Surface((self.grid_size, self.grid_size))
+        surface.fill(LIME_GREEN)
+
+        # Draw a smaller rectangle inside for a better look
+        inner_rect = pygame.Rect(2, 2, self.grid_size - 4, self.grid_size - 4)
+        pygame.draw.rect(surface, (0, 220, 0), inner_rect)  # Lighter green for inner part
+        return surface
+
+    def _render_head(self, direction):
+        size = self.grid_size
+        surface = pygame.Surface((size, size))
+        surface.fill(LIGHT_GREEN)  # Darker green for head
+
+        # Draw eyes
+        eye_size = size // 5
+        dx, dy = direction
+
+        # Position the eyes based on the direction
+        if dx == 1:  # Right
+            left_eye = (3 * size // 4, size // 4)
+            right_eye = (3 * size // 4, 3 * size // 4)
+        elif dx == -1:  # Left
+            left_eye = (size // 4, size // 4)
+            right_eye = (size // 4, 3 * size // 4)
+        elif dy == 1:  # Down
+            left_eye = (size // 4, 3 * size // 4)
+            right_eye = (3 * size // 4, 3 * size // 4)
+        else:  # Up
+            left_eye = (size // 4, size // 4)
+            right_eye = (3 * size // 4, size // 4)
+
+        pygame.draw.circle(surface, WHITE, left_eye, eye_size)  # White eye
+        pygame.draw.circle(surface, WHITE, right_eye, eye_size)  # White eye
+        pygame.draw.circle(surface, BLACK, left_eye, eye_size // 2)  # Black pupil
+        pygame.draw.circle(surface, BLACK, right_eye, eye_size // 2)  # Black pupil
+        return surface
+
+    def _render_apple(self):
+        size = self.grid_size
+        surface = self._render_tile()
+
+        # Draw the apple body
+        apple_rect = pygame.Rect(size * 0.15, size * 0.3, size * 0.7, size * 0.7)
+        pygame.draw.circle(surface, (255, 0, 0), apple_rect.center, size * 0.7 // 2)  # Red apple
+
+        # Draw a small green stem
+        stem_rect = pygame.Rect(size // 2 - 2, 2, 4, size // 4)
+        pygame.draw.rect(surface, (0, 100, 0), stem_rect)
+
+        # Draw a small leaf
+        leaf_points = [
+            (size // 2, 6),
+            (size // 2 + 6, 0),
+            (size // 2 + 10, 4)
+        ]
+        pygame.draw.polygon(surface, (0, 180, 0), leaf_points)
+        return surface
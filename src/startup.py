@@ -0,0 +1,34 @@
+# Startup timing, like python -X importtime but for assets, to keep track of the time to the first frame
+# Run with --startup-report or set SNAKE_STARTUP_REPORT=1 to print it once the first frame is shown
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+START = time.perf_counter()
+enabled = "--startup-report" in sys.argv or bool(os.environ.get("SNAKE_STARTUP_REPORT"))
+
+# (name, milliseconds since start, duration in milliseconds)
+timings = []
+
+
+@contextmanager
+def timed(name):
+    """Record how long the block takes"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        timings.append((name, (start - START) * 1000, (end - start) * 1000))
+
+
+def mark(name):
+    """Record a point in time, like the first frame being shown"""
+    timings.append((name, (time.perf_counter() - START) * 1000, 0.0))
+
+
+def report(file=sys.stderr):
+    print(f"{'at ms':>9} | {'took ms':>9} | step", file=file)
+    for name, at, duration in sorted(timings, key=lambda timing: timing[1]):
+        print(f"{at:9.1f} | {duration:9.1f} | {name}", file=file)
@@ -0,0 +1,76 @@
+# Shared fonts and a cache of rendered text, so unchanged labels cost a blit instead of glyph rendering
+from collections import OrderedDict
+import pygame
+from src.startup import timed
+
+# Fonts by (name, size)
+_fonts = {}
+
+
+def get_font(name, size):
+    """Shared system font, name None is pygame's default font"""
+    font = _fonts.get((name, size))
+    if font is None:
+        # The first system font lookup scans every installed font, which is slow on some platforms
+        with timed(f"font {name} {size}"):
+            font = _fonts[(name, size)] = pygame.font.SysFont(name, size)
+    return font
+
+
+class LazyFont:
+    """Stands in for a font that is only looked up the first time it is used"""
+    def __init__(self, name, size):
+        # Underscored so they don't hide the font's own attributes, like size()
+        self._name = name
+        self._size = size
+        self._font = None
+
+    def load(self):
+        if self._font is None:
+            self._font = get_font(self._name, self._size)
+        return self._font
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+class TextCache:
+    def __init__(self, max_size=256):
+        # Rendered surfaces by (font, text, antialias, color), least recently used first
+        self.surfaces = OrderedDict()
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color):
+        """Same as font.render, the returned surface is shared and must not be drawn on"""
+        key = (font, text, antialias, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.surfaces[key] = font.render(text, antialias, color)
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    @property
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def clear(self):
+        self.surfaces.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color):
+    """Render text through the shared cache"""
+    return text_cache.render(font, text, antialias, color)
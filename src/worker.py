@@ -0,0 +1,60 @@
+# Runs slow work, like building the statistics graphs, on a background thread so the UI keeps responding
+import threading
+
+
+class Worker:
+    """Runs function(*args, cancelled) for the latest request only
+    Requests made while one is running replace any that are still waiting, and results of
+    replaced requests are thrown away. function can call cancelled() to stop early."""
+    def __init__(self, function, name="worker"):
+        self.function = function
+        self.name = name
+        self.lock = threading.Lock()
+        self.wake = threading.Condition(self.lock)
+        self.thread = None
+        self.latest = 0  # Id of the newest request, anything older is stale
+        self.pending = None  # (request id, args) waiting to run
+        self.result = None  # (request id, result) waiting to be picked up
+
+    def request(self, *args):
+        """Queue a request, replacing any that hasn't started yet"""
+        with self.lock:
+            self.latest += 1
+            self.pending = (self.latest, args)
+            self.result = None
+            self.wake.notify()
+
+        # Started on first use, there's no need for a thread until then
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self.thread.start()
+
+    def cancel(self):
+        """Drop the waiting request and ignore the result of the running one"""
+        with self.lock:
+            self.latest += 1
+            self.pending = None
+            self.result = None
+
+    def poll(self):
+        """Result of the latest request, or None if it isn't ready yet"""
+        with self.lock:
+            if self.result is None or self.result[0] != self.latest:
+                return None
+            result = self.result[1]
+            self.result = None
+            return result
+
+    def _run(self):
+        while True:
+            with self.lock:
+                while self.pending is None:
+                    self.wake.wait()
+                request_id, args = self.pending
+                self.pending = None
+
+            result = self.function(*args, lambda: request_id != self.latest)
+
+            with self.lock:
+                if request_id == self.latest:
+                    self.result = (request_id, result)
@@ -0,0 +1,82 @@
+from src.audio import AudioService
+
+
+class FakeBackend:
+    """Channels that stay busy until stopped or finished by the test"""
+    def __init__(self, channels):
+        self.channels = channels
+        self.busy = [False] * channels
+        self.played = []
+        self.stopped = []
+
+    def is_busy(self, channel):
+        return self.busy[channel]
+
+    def play(self, channel, name):
+        self.busy[channel] = True
+        self.played.append((channel, name))
+
+    def stop(self, channel):
+        self.busy[channel] = False
+        self.stopped.append(channel)
+
+
+PRIORITIES = {"collision": 2, "apple_eaten": 1, "turn": 0}
+
+
+def test_steals_the_oldest_lowest_priority_voice():
+    backend = FakeBackend(3)
+    audio = AudioService(backend, PRIORITIES)
+    for now, name in enumerate(["apple_eaten", "turn", "turn"]):
+        audio.post(name)
+        audio.update(now)
+    assert backend.played == [(0, "apple_eaten"), (1, "turn"), (2, "turn")]
+
+    # Every channel is busy, the oldest turn makes way
+    audio.post("collision")
+    audio.update(10)
+    assert backend.stopped == [1]
+    assert backend.played[-1] == (1, "collision")
+
+    # A turn can cut off the other turn, but nothing more important
+    audio.post("turn")
+    audio.update(11)
+    assert backend.played[-1] == (2, "turn")
+    audio.post("turn")
+    audio.update(12)
+    assert backend.played[-1] == (2, "turn")
+    assert backend.stopped == [1, 2, 2]
+
+
+def test_drops_sounds_that_would_cut_off_more_important_ones():
+    backend = FakeBackend(2)
+    audio = AudioService(backend, PRIORITIES)
+    audio.post_all(["collision", "apple_eaten", "turn"])
+    audio.update(0)
+    audio.post("turn")
+    audio.update(1)
+    assert backend.played == [(0, "collision"), (1, "apple_eaten")]
+    assert backend.stopped == []
+    assert audio.dropped == 2
+
+
+def test_free_channels_are_reused_first():
+    backend = FakeBackend(2)
+    audio = AudioService(backend, PRIORITIES)
+    audio.post_all(["collision", "collision"])
+    audio.update(0)
+    backend.busy[0] = False  # Finished playing
+    audio.post("turn")
+    audio.update(5)
+    assert backend.played[-1] == (0, "turn")
+    assert backend.stopped == []
+
+
+def test_rate_limit():
+    backend = FakeBackend(8)
+    audio = AudioService(backend, PRIORITIES, {"turn": 40})
+    for now in (0, 10, 39, 40, 60, 80):
+        audio.post("turn")
+        audio.update(now)
+    assert len(backend.played) == 3
+    assert audio.dropped == 3
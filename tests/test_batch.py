@@ -0,0 +1,62 @@
+import random
+import numpy as np
+from src.batch import BatchGame, PLAYING, GAME_OVER, GAME_WON, UP, DOWN, LEFT, RIGHT
+from src.bot import greedy_action
+from src.game import Game
+from src.grid import APPLE, EMPTY
+
+ACTION_CODES = {(0, -1): UP, (0, 1): DOWN, (-1, 0): LEFT, (1, 0): RIGHT}
+STATES = {PLAYING: "game", GAME_OVER: "game_over", GAME_WON: "game_won"}
+
+
+def batch_body(batch, i):
+    """Cells of game i's snake, head first, as (x, y)"""
+    cells = [batch.body[i, (batch.head_ptr[i] - k) % batch.square_num] for k in range(batch.length[i])]
+    return [(int(cell) % batch.width, int(cell) // batch.width) for cell in cells]
+
+
+def place_apples(game, cells, width):
+    """Move the game's apples to the given flat cells, as the two simulators draw them differently"""
+    grid = game.board.grid
+    for x, y in game.apple.positions:
+        grid.set(x, y, EMPTY)
+    game.apple.positions = {(int(cell) % width, int(cell) // width) for cell in cells}
+    for x, y in game.apple.positions:
+        grid.set(x, y, APPLE)
+
+
+def test_batch_matches_game():
+    for seed in range(12):
+        width, height = 6 + seed % 3, 5 + seed % 2
+        rules = {"on_wall_collision": "ET"[seed % 2], "apple_count": 1 + seed % 2}
+        batch = BatchGame(1, width, height, rules, seed)
+        game = Game(width, height, rules, seed)
+        rng = random.Random(seed)
+
+        state = "game"
+        while state == "game" and game.ticks < 2000:
+            place_apples(game, np.flatnonzero(batch.grid[0] == APPLE), width)
+            action = greedy_action(game, rng)
+            if action is not None and rng.random() < 0.1:
+                action = rng.choice(list(ACTION_CODES))
+
+            states, scores = batch.step([ACTION_CODES[action] if action else -1])
+            state = game.step(action)
+
+            assert STATES[states[0]] == state
+            assert scores[0] == game.score
+            if state == "game":
+                assert batch_body(batch, 0) == list(game.snake.segments)
+        assert state != "game"
+
+
+def test_finished_games_are_reset():
+    batch = BatchGame(4, 5, 5, {"on_wall_collision": "E", "apple_count": 1}, 0)
+    # Running straight right hits the wall on the third move from the centre
+    for _ in range(2):
+        states, _ = batch.step()
+        assert (states == PLAYING).all()
+    states, _ = batch.step()
+    assert (states == GAME_OVER).all()
+    assert (batch.length == 1).all() and (batch.ticks == 0).all()
+    assert ((batch.grid == APPLE).sum(axis=1) == 1).all()
@@ -0,0 +1,85 @@
+import random
+from src.bot import greedy_action
+from src.game import Game
+from src.grid import SNAKE
+
+
+class ListSnake:
+    """The moves of the original Snake.update: the body is a list and self-collision is checked against it"""
+    def __init__(self, game):
+        self.width = game.width
+        self.height = game.height
+        self.wrap = game.rules["on_wall_collision"] == "T"
+        self.segments = list(game.snake.segments)
+        self.growth_pending = 0
+        self.score = 0
+        self.TIME_BONUS = round((self.width * self.height) ** 0.5 * 0.4, 1)
+        self.time_bonus_factor = 0.9 / (self.width * self.height)
+        self.time_bonus = 0
+
+    def update(self, direction, apples):
+        head_x, head_y = self.segments[0]
+        x, y = head_x + direction[0], head_y + direction[1]
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            if not self.wrap:
+                return "game_over"
+            x %= self.width
+            y %= self.height
+
+        if (x, y) in apples:
+            self.score += 10 + int(round(self.time_bonus)) * 5
+            self.time_bonus = min(self.score * self.time_bonus_factor, self.TIME_BONUS)
+            self.growth_pending += 1
+
+        if self.growth_pending > 0:
+            self.growth_pending -= 1
+        else:
+            self.segments.pop()
+
+        if (x, y) in self.segments:
+            return "game_over"
+        self.segments.insert(0, (x, y))
+        if len(self.segments) >= self.width * self.height:
+            return "game_won"
+
+        if self.time_bonus >= 0:
+            self.time_bonus -= 0.06
+        return "game"
+
+
+def test_step_matches_the_list_based_snake():
+    runs = 0
+    for seed in range(36):
+        rules = {"on_wall_collision": "ET"[seed % 2], "apple_count": 1 + seed % 3}
+        game = Game(6 + seed % 5, 5 + seed % 4, rules, seed)
+        reference = ListSnake(game)
+        rng = random.Random(seed)
+
+        while game.state == "game" and game.ticks < 2000:
+            # Mostly the bot, with random turns so the snake also runs into walls and itself
+            action = greedy_action(game, rng) if rng.random() < 0.9 else rng.choice([(0, -1), (0, 1), (-1, 0), (1, 0)])
+            if action is not None:
+                game.steer(*action)
+            apples = set(game.apple.positions)
+            expected = reference.update(game.snake.direction, apples)
+
+            assert game.step() == expected
+            assert game.score == reference.score
+            if expected == "game":
+                assert list(game.snake.segments) == reference.segments
+                # The grid marks exactly the snake's cells
+                assert {(x, y) for x in range(game.width) for y in range(game.height)
+                        if game.board.grid.get(x, y) == SNAKE} == set(reference.segments)
+        runs += game.state != "game"
+    assert runs == 36
+
+
+def test_same_seed_same_game():
+    def play(seed):
+        game = Game(10, 8, {"on_wall_collision": "T", "apple_count": 2}, seed)
+        rng = random.Random(seed)
+        while game.step(greedy_action(game, rng)) == "game" and game.ticks < 1000:
+            pass
+        return game.score, game.ticks, list(game.snake.segments)
+
+    assert play(7) == play(7)
@@ -0,0 +1,51 @@
+import random
+from src.grid import Grid, EMPTY, SNAKE, APPLE
+
+
+def assert_index_in_sync(grid):
+    """free_cells holds exactly the empty cells and free_pos points at each one's slot"""
+    empty = {i for i, state in enumerate(grid.cells) if state == EMPTY}
+    assert sorted(grid.free_cells) == sorted(empty)
+    for i in range(len(grid.cells)):
+        if i in empty:
+            assert grid.free_cells[grid.free_pos[i]] == i
+        else:
+            assert grid.free_pos[i] == -1
+
+
+def test_free_cells_follow_set_and_clear():
+    grid = Grid(7, 5)
+    rng = random.Random(0)
+    for _ in range(2000):
+        x, y = rng.randrange(7), rng.randrange(5)
+        if rng.random() < 0.4:
+            grid.clear(x, y)
+        else:
+            grid.set(x, y, rng.choice([SNAKE, APPLE]))
+        assert_index_in_sync(grid)
+    assert grid.count(EMPTY) == len(grid.free_cells)
+
+
+def test_setting_the_same_state_twice_keeps_the_index():
+    grid = Grid(3, 3)
+    grid.set(1, 1, SNAKE)
+    grid.set(1, 1, SNAKE)
+    grid.set(1, 1, APPLE)
+    grid.clear(0, 0)
+    assert_index_in_sync(grid)
+    assert grid.count(EMPTY) == 8
+
+
+def test_random_free_only_returns_empty_cells():
+    grid = Grid(4, 4)
+    rng = random.Random(1)
+    for x in range(4):
+        for y in range(3):
+            grid.set(x, y, SNAKE)
+    for _ in range(100):
+        x, y = grid.random_free(rng)
+        assert grid.get(x, y) == EMPTY
+
+    for x in range(4):
+        grid.set(x, 3, SNAKE)
+    assert grid.random_free(rng) is None
@@ -0,0 +1,53 @@
+import sqlite3
+from src.db_handler import SCHEMA_VERSION, UNKNOWN_MODE, connect_database, get_scores_data
+
+# The scores table of the original game, before PRAGMA user_version was used
+VERSION_0_SCHEMA = """
+CREATE TABLE scores (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    player_name TEXT,
+    snake_speed TEXT,
+    board_size TEXT,
+    score INTEGER,
+    date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)"""
+
+
+def make_version_0(path, rows):
+    conn = sqlite3.connect(path)
+    conn.execute(VERSION_0_SCHEMA)
+    conn.executemany("INSERT INTO scores (player_name, snake_speed, board_size, score) VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_rows_with_null_columns(tmp_path):
+    path = str(tmp_path / "scores.db")
+    make_version_0(path, [
+        ("Ann", "Slow", "Small", 10),
+        ("Ann", "Slow", "Small", 30),
+        ("Bob", "Slow", "Small", 20),
+        (None, "Fast", "Large", 5),
+        ("Cat", None, "Small", 7),
+        ("Cat", "Slow", None, 8),
+        ("Dan", None, None, None),
+    ])
+
+    conn, _ = connect_database(path)
+    assert conn is not None
+    assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0] == 7
+    assert conn.execute("SELECT COUNT(*) FROM best_scores").fetchone()[0] == 6
+
+    unknown_speed = conn.execute("""
+        SELECT players.name, scores.score FROM scores
+        JOIN players ON players.id = scores.player_id
+        JOIN modes ON modes.id = scores.mode_id
+        WHERE modes.snake_speed = ? AND modes.board_size = ?""", (UNKNOWN_MODE, "Small")).fetchall()
+    assert unknown_speed == [("Cat", 7)]
+    conn.close()
+
+    names, scores, _ = get_scores_data("Slow", "Small", True, path)
+    assert list(zip(names, scores)) == [("Ann", 30), ("Bob", 20)]
+    names, scores, _ = get_scores_data(UNKNOWN_MODE, UNKNOWN_MODE, True, path)
+    assert list(zip(names, scores)) == [("Dan", 0)]
@@ -0,0 +1,78 @@
+import random
+import pytest
+from src.bot import greedy_action
+from src.game import Game
+from src.replay import Replay, HEADER, INPUT, play
+
+
+def record(seed, rules):
+    game = Game(12, 10, rules, seed)
+    rng = random.Random(seed)
+    while game.state == "game" and game.ticks < 3000:
+        # Several turns between some moves, so the input queue gets recorded too
+        for _ in range(rng.choice([0, 1, 1, 2])):
+            action = greedy_action(game, rng) or rng.choice([(0, -1), (0, 1), (-1, 0), (1, 0)])
+            game.steer(*action)
+        game.step()
+    return game
+
+
+def test_bytes_round_trip():
+    game = record(3, {"on_wall_collision": "T", "apple_count": 2})
+    replay = Replay.from_game(game)
+    data = replay.to_bytes()
+    loaded = Replay.from_bytes(data)
+
+    assert (loaded.seed, loaded.width, loaded.height) == (game.seed, 12, 10)
+    assert loaded.rules == game.rules
+    assert loaded.inputs == game.inputs
+    assert len(data) == HEADER.size + 5 * len(game.inputs)
+    assert loaded.to_bytes() == data
+
+
+@pytest.mark.parametrize("wall", ["E", "T"])
+@pytest.mark.parametrize("apple_count", [1, 3])
+def test_play_reproduces_the_game(wall, apple_count):
+    for seed in range(10):
+        game = record(seed, {"on_wall_collision": wall, "apple_count": apple_count})
+        replayed = play(Replay.from_bytes(Replay.from_game(game).to_bytes()))
+        assert (replayed.score, replayed.ticks, replayed.state) == (game.score, game.ticks, game.state)
+        assert list(replayed.snake.segments) == list(game.snake.segments)
+
+
+def test_rejects_other_data():
+    data = Replay.from_game(record(0, {"on_wall_collision": "T", "apple_count": 1})).to_bytes()
+    with pytest.raises(ValueError):
+        Replay.from_bytes(b"XXXX" + data[4:])
+    with pytest.raises(ValueError):
+        Replay.from_bytes(data[:4] + bytes([3]) + data[5:])
+
+    # Damaged replays fail the same way instead of crashing the callers
+    assert len(data) > HEADER.size
+    damaged = [
+        b"",
+        b"SNK",
+        data[:HEADER.size - 1],
+        data[:-1],  # Last input cut off
+        data + b"\x00",
+        data[:HEADER.size] + INPUT.pack(0, 9),  # Unknown direction
+        data[:HEADER.size - 2] + b"X" + data[HEADER.size - 1:],  # Unknown wall rule
+    ]
+    for bad in damaged:
+        with pytest.raises(ValueError):
+            Replay.from_bytes(bad)
+
+    # A header with no inputs is a game where the player never turned
+    assert Replay.from_bytes(data[:HEADER.size]).inputs == []
+
+
+def test_plays_version_1_replays_of_one_apple_games():
+    for apple_count in (1, 2):
+        game = record(4, {"on_wall_collision": "E", "apple_count": apple_count})
+        data = Replay.from_game(game).to_bytes()
+        version_1 = data[:4] + bytes([1]) + data[5:]
+        if apple_count == 1:
+            assert play(Replay.from_bytes(version_1)).score == game.score
+        else:
+            with pytest.raises(ValueError):
+                Replay.from_bytes(version_1)
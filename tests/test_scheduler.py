@@ -0,0 +1,34 @@
+import random
+from src.scheduler import FixedTimestep
+
+
+def test_ticks_at_a_steady_rate():
+    clock = FixedTimestep(10)  # 100 ms per tick
+    ticks = sum(clock.advance(16) for _ in range(100))
+    assert ticks == 16
+    assert clock.accumulator == 0
+
+
+def test_catch_up_is_clamped():
+    clock = FixedTimestep(10, max_catch_up=5)
+    assert clock.advance(1250) == 5
+    # The rest of the stall is dropped, only the part of a tick is kept
+    assert abs(clock.accumulator - 50) < 1e-6
+    assert abs(clock.dropped_time - 700) < 1e-6
+    assert clock.advance(0) == 0
+
+
+def test_alpha_stays_between_0_and_1():
+    clock = FixedTimestep(6, max_catch_up=3)
+    rng = random.Random(0)
+    for _ in range(10000):
+        ticks = clock.advance(rng.choice([0, 1, 16.7, 33.3, 166.7, 1000, rng.uniform(0, 3000)]))
+        assert 0 <= ticks <= 3
+        assert 0 <= clock.alpha < 1
+
+
+def test_reset():
+    clock = FixedTimestep(10, max_catch_up=1)
+    clock.advance(550)
+    clock.reset()
+    assert clock.accumulator == 0 and clock.dropped_time == 0 and clock.alpha == 0
@@ -0,0 +1,52 @@
+import pygame
+from src.screen_cache import CachedScreen
+
+
+class Box:
+    """A widget that fills its bounds and counts how often it was drawn"""
+    def __init__(self, x, y, color):
+        self.bounds = pygame.Rect(x, y, 20, 20)
+        self.color = color
+        self.dirty = True
+        self.draws = 0
+
+    def draw(self, surface):
+        surface.fill(self.color, self.bounds)
+        self.draws += 1
+
+
+def test_only_changed_widgets_are_redrawn():
+    backgrounds = []
+    moving = Box(10, 10, (255, 0, 0))
+    still = Box(100, 100, (0, 255, 0))
+    screen = CachedScreen(lambda surface: backgrounds.append(surface.fill((0, 0, 50))), [moving, still])
+    surface = pygame.Surface((200, 200))
+
+    assert screen.draw(surface) == [surface.get_rect()]
+    assert (moving.draws, still.draws, len(backgrounds)) == (1, 1, 1)
+    assert screen.draw(surface) == []
+
+    # Moving a widget repaints where it was and where it is, and nothing else
+    moving.bounds.x = 30
+    moving.dirty = True
+    assert screen.draw(surface) == [pygame.Rect(10, 10, 40, 20)]
+    assert (moving.draws, still.draws, len(backgrounds)) == (2, 1, 1)
+    assert surface.get_at((15, 15)) == (0, 0, 50)
+    assert surface.get_at((45, 15)) == (255, 0, 0)
+    assert surface.get_at((110, 110)) == (0, 255, 0)
+
+
+def test_invalidate():
+    backgrounds = []
+    box = Box(0, 0, (255, 0, 0))
+    screen = CachedScreen(lambda surface: backgrounds.append(1), [box])
+    surface = pygame.Surface((50, 50))
+    screen.draw(surface)
+
+    screen.invalidate()
+    assert screen.draw(surface) == [surface.get_rect()]
+    assert (box.draws, len(backgrounds)) == (2, 1)
+
+    screen.invalidate(background=True)
+    screen.draw(surface)
+    assert (box.draws, len(backgrounds)) == (3, 2)
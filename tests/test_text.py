@@ -0,0 +1,52 @@
+from src.text import TextCache
+
+
+class CountingFont:
+    """Stands in for a pygame font, counts how many times text was actually rendered"""
+    def __init__(self):
+        self.renders = 0
+
+    def render(self, text, antialias, color):
+        self.renders += 1
+        return (text, antialias, color, self.renders)
+
+
+def test_hits_return_the_cached_surface():
+    cache = TextCache()
+    font = CountingFont()
+    first = cache.render(font, "Score: 10", True, (255, 255, 255))
+    assert cache.render(font, "Score: 10", True, [255, 255, 255]) is first
+    assert font.renders == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.hit_rate == 0.5
+
+    # Any part of the key changing is a miss
+    cache.render(font, "Score: 10", False, (255, 255, 255))
+    cache.render(font, "Score: 10", True, (0, 0, 0))
+    cache.render(CountingFont(), "Score: 10", True, (255, 255, 255))
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_evicts_the_least_recently_used():
+    cache = TextCache(max_size=3)
+    font = CountingFont()
+    for text in "abc":
+        cache.render(font, text, True, (0, 0, 0))
+    cache.render(font, "a", True, (0, 0, 0))  # "b" is now the least recently used
+    cache.render(font, "d", True, (0, 0, 0))
+
+    assert len(cache.surfaces) == 3
+    assert [key[1] for key in cache.surfaces] == ["c", "a", "d"]
+    renders = font.renders
+    cache.render(font, "a", True, (0, 0, 0))
+    assert font.renders == renders
+    cache.render(font, "b", True, (0, 0, 0))
+    assert font.renders == renders + 1
+
+
+def test_clear():
+    cache = TextCache()
+    cache.render(CountingFont(), "a", True, (0, 0, 0))
+    cache.clear()
+    assert not cache.surfaces
+    assert (cache.hits, cache.misses, cache.hit_rate) == (0, 0, 0.0)
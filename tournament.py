@@ -0,0 +1,105 @@
+# Plays bot games for every snake speed and board size in parallel and reports the results
+# Usage: python tournament.py --games 200 --workers 8
+import argparse
+import os
+import random
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from src.bot import greedy_action
+from src.db_handler import connect_database, save_scores
+from src.game import Game
+from src.rules import speeds, board_sizes, board_dimensions
+
+
+def play_batch(snake_speed, board_size, games, seed, max_ticks):
+    """Play a batch of bot games in one mode, returns the (score, ticks) of each game"""
+    # Bot moves and the seed of each game come from the batch's own generator, so a batch replays the same way
+    rng = random.Random(seed)
+    _, width, height = board_dimensions(board_size)
+
+    results = []
+    start = time.perf_counter()
+    for _ in range(games):
+        game = Game(width, height, seed=rng.randrange(2 ** 63))
+        while game.step(greedy_action(game, rng)) == "game" and game.ticks < max_ticks:
+            game.drain_events()
+        results.append((game.score, game.ticks))
+    return snake_speed, board_size, results, time.perf_counter() - start
+
+
+def positive_int(value):
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Play bot games in every game mode on all cores")
+    parser.add_argument("--games", type=positive_int, default=100, help="games per speed/board size combination")
+    parser.add_argument("--batch-size", type=positive_int, default=25, help="games per worker task and per transaction")
+    parser.add_argument("--workers", type=positive_int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="base seed, each batch gets its own seed from it")
+    parser.add_argument("--max-ticks", type=positive_int, default=100000, help="end a game after this many moves")
+    parser.add_argument("--player", default="Bot", help="player name saved with the scores")
+    parser.add_argument("--db", default="snake_game.db", help="database to save the scores to")
+    parser.add_argument("--no-save", action="store_true", help="don't save the scores")
+    return parser.parse_args()
+
+
+def print_report(results, cpu_time, wall_time):
+    print(f"{'Speed':<8}{'Board':<8}{'Games':>7}{'Mean':>9}{'Median':>9}{'P90':>7}{'Max':>7}"
+          f"{'Length':>9}{'Ticks/s':>11}")
+    total_ticks = 0
+    for (snake_speed, board_size), games in results.items():
+        scores = sorted(score for score, _ in games)
+        ticks = [game_ticks for _, game_ticks in games]
+        total_ticks += sum(ticks)
+        p90 = scores[min(len(scores) - 1, int(len(scores) * 0.9))]
+        rate = sum(ticks) / cpu_time[snake_speed, board_size] if cpu_time[snake_speed, board_size] else 0
+        print(f"{snake_speed:<8}{board_size:<8}{len(scores):>7}{statistics.mean(scores):>9.1f}"
+              f"{statistics.median(scores):>9.1f}{p90:>7}{scores[-1]:>7}{statistics.mean(ticks):>9.1f}{rate:>11.0f}")
+
+    games_played = sum(len(games) for games in results.values())
+    print(f"\n{games_played} games, {total_ticks} ticks in {wall_time:.2f}s "
+          f"({games_played / wall_time:.1f} games/s, {total_ticks / wall_time:.0f} ticks/s)")
+
+
+def main():
+    args = parse_args()
+
+    conn, cursor = (None, None) if args.no_save else connect_database(args.db)
+
+    # Split every mode into batches, each batch is played by one worker and saved in one transaction
+    jobs = []
+    for snake_speed in speeds:
+        for board_size in board_sizes:
+            for start in range(0, args.games, args.batch_size):
+                jobs.append((snake_speed, board_size, min(args.batch_size, args.games - start)))
+
+    results = {(snake_speed, board_size): [] for snake_speed in speeds for board_size in board_sizes}
+    cpu_time = dict.fromkeys(results, 0.0)
+
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(play_batch, snake_speed, board_size, games, args.seed + i, args.max_ticks)
+                   for i, (snake_speed, board_size, games) in enumerate(jobs)]
+
+        for future in as_completed(futures):
+            snake_speed, board_size, games, elapsed = future.result()
+            results[snake_speed, board_size].extend(games)
+            cpu_time[snake_speed, board_size] += elapsed
+
+            if conn:
+                save_scores(cursor, conn, [(args.player, snake_speed, board_size, score) for score, _ in games])
+    wall_time = time.perf_counter() - wall_start
+
+    if conn:
+        conn.close()
+
+    print_report(results, cpu_time, wall_time)
+
+
+if __name__ == "__main__":
+    main()